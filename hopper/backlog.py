@@ -1,18 +1,30 @@
 # SPDX-License-Identifier: AGPL-3.0-only
 # Copyright (c) 2026 sol pbc
 
-"""Backlog management for hopper."""
+"""Backlog management for hopper.
+
+backlog.jsonl is an append-only log: each line is either an item dict or a
+tombstone {"removed": "<id>"} recording a removal. load_backlog folds the log
+into the live item list without writing; save_backlog rewrites it compacted.
+"""
 
 import json
-import os
 import secrets
 from dataclasses import dataclass
 
 from hopper import config
+from hopper.fsutil import append_synced, atomic_write, fsync_dir
 from hopper.lodes import ID_ALPHABET, ID_LEN, current_time_ms
 
+COMPACT_MIN_TOMBSTONES = 16  # Don't compact until at least this many removals accrue
+
+# Tombstones in the backlog file since it was last loaded or compacted
+_tombstones = 0
+# Whether the last load found a torn final line; the next write rewrites the file
+_torn = False
 
-@dataclass
+
+@dataclass(slots=True)
 class BacklogItem:
     """A backlog item."""
 
@@ -43,32 +55,70 @@ class BacklogItem:
 
 
 def load_backlog() -> list[BacklogItem]:
-    """Load backlog items from JSONL file."""
+    """Load backlog items from JSONL file, applying any removal tombstones.
+
+    Never writes: the CLI reads the file while the server may be appending.
+    """
+    global _tombstones, _torn
+    _tombstones = 0
+    _torn = False
     backlog_file = config.hopper_dir() / "backlog.jsonl"
     if not backlog_file.exists():
         return []
 
-    items = []
-    with open(backlog_file) as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                data = json.loads(line)
-                items.append(BacklogItem.from_dict(data))
-    return items
+    # Read in one go and split; json.loads accepts UTF-8 bytes directly
+    lines = backlog_file.read_bytes().split(b"\n")
+    # Every record ends in a newline, so an unterminated tail is a torn append
+    tail = lines.pop()
+    items: dict[str, BacklogItem] = {}
+    for line in lines:
+        if line.strip():
+            _apply_record(items, json.loads(line))
+    if tail.strip():
+        try:
+            _apply_record(items, json.loads(tail))
+        except ValueError:  # Bad JSON, or UTF-8 cut mid-character
+            pass
+        # Left on disk; the next write rewrites instead of appending after it
+        _torn = True
+    return list(items.values())
+
+
+def _apply_record(items: dict[str, BacklogItem], data: dict) -> None:
+    """Fold one backlog.jsonl record (item or removal tombstone) into items."""
+    global _tombstones
+    if "removed" in data:
+        items.pop(data["removed"], None)
+        _tombstones += 1
+    else:
+        items[data["id"]] = BacklogItem.from_dict(data)
 
 
 def save_backlog(items: list[BacklogItem]) -> None:
-    """Atomically save backlog items to JSONL file."""
+    """Atomically save backlog items to JSONL file, dropping any tombstones."""
+    global _tombstones, _torn
     backlog_file = config.hopper_dir() / "backlog.jsonl"
     backlog_file.parent.mkdir(parents=True, exist_ok=True)
 
-    tmp_path = backlog_file.with_suffix(".jsonl.tmp")
-    with open(tmp_path, "w") as f:
-        for item in items:
-            f.write(json.dumps(item.to_dict()) + "\n")
+    payload = "".join(json.dumps(item.to_dict()) + "\n" for item in items).encode()
+    atomic_write(backlog_file, payload)
+    fsync_dir(backlog_file.parent)
+    _tombstones = 0
+    _torn = False
+
+
+def _append_record(items: list[BacklogItem], record: dict) -> None:
+    """Append a single record to the backlog file and fsync it.
 
-    os.replace(tmp_path, backlog_file)
+    If the last load found a torn final line, rewrite from items (which
+    already reflect the record) instead, so the record doesn't land on it.
+    """
+    if _torn:
+        save_backlog(items)
+        return
+    backlog_file = config.hopper_dir() / "backlog.jsonl"
+    backlog_file.parent.mkdir(parents=True, exist_ok=True)
+    append_synced(backlog_file, (json.dumps(record) + "\n").encode())
 
 
 def add_backlog_item(
@@ -77,7 +127,7 @@ def add_backlog_item(
     description: str,
     lode_id: str | None = None,
 ) -> BacklogItem:
-    """Create a new backlog item, add to list, and persist."""
+    """Create a new backlog item, add to list, and append it to the backlog file."""
     # Generate unique ID (collision unlikely but check anyway)
     existing_ids = {item.id for item in items}
     for _ in range(100):
@@ -95,16 +145,24 @@ def add_backlog_item(
         lode_id=lode_id,
     )
     items.append(item)
-    save_backlog(items)
+    _append_record(items, item.to_dict())
     return item
 
 
 def remove_backlog_item(items: list[BacklogItem], item_id: str) -> BacklogItem | None:
-    """Remove a backlog item by ID. Returns the removed item or None."""
+    """Remove a backlog item by ID. Returns the removed item or None.
+
+    Appends a tombstone rather than rewriting the file, compacting once
+    tombstones outnumber half the remaining items.
+    """
+    global _tombstones
     for i, item in enumerate(items):
         if item.id == item_id:
             removed = items.pop(i)
-            save_backlog(items)
+            _append_record(items, {"removed": removed.id})
+            _tombstones += 1
+            if _tombstones >= COMPACT_MIN_TOMBSTONES and _tombstones > len(items) // 2:
+                save_backlog(items)
             return removed
     return None
 
@@ -123,7 +181,14 @@ def update_backlog_item(
 
 def find_by_prefix(items: list[BacklogItem], prefix: str) -> BacklogItem | None:
     """Find a backlog item by ID prefix. Returns None if not found or ambiguous."""
-    matches = [item for item in items if item.id.startswith(prefix)]
-    if len(matches) == 1:
-        return matches[0]
-    return None
+    # A full-length ID can only match one item (IDs are unique)
+    if len(prefix) == ID_LEN:
+        return next((item for item in items if item.id == prefix), None)
+
+    match = None
+    for item in items:
+        if item.id.startswith(prefix):
+            if match is not None:
+                return None  # Ambiguous, no need to keep scanning
+            match = item
+    return match
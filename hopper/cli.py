@@ -7,8 +7,6 @@ import sys
 from collections.abc import Callable
 from pathlib import Path
 
-import setproctitle
-
 from hopper import __version__, config
 
 
@@ -906,7 +904,9 @@ def main() -> int:
         print_help()
         return 1
 
-    # Set process title
+    # Set process title (imported here so help/version paths skip the C extension)
+    import setproctitle
+
     setproctitle.setproctitle(f"hop:{cmd}")
 
     # Dispatch to command handler
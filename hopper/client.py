@@ -5,6 +5,7 @@
 
 import json
 import logging
+import os
 import queue
 import socket
 import threading
@@ -16,6 +17,8 @@ from hopper.lodes import current_time_ms
 
 logger = logging.getLogger(__name__)
 
+CLIENT_RECV_CHUNK = 65536  # Bytes per recv; typical responses arrive in a single read
+
 
 class HopperConnection:
     """Persistent bidirectional connection to the hopper server.
@@ -32,6 +35,7 @@ class HopperConnection:
             socket_path: Path to Unix socket
         """
         self.socket_path = socket_path
+        self._address = os.fsencode(socket_path)  # Encoded once, reused on reconnect
         self.send_queue: queue.Queue = queue.Queue(maxsize=1000)
         self.callback: Callable[[dict[str, Any]], Any] | None = None
         self.on_connect: Callable[[], Any] | None = None
@@ -73,7 +77,7 @@ class HopperConnection:
             if not sock and time.time() - last_connect_attempt > 1.0:
                 try:
                     sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-                    sock.connect(str(self.socket_path))
+                    sock.connect(self._address)
                     sock.settimeout(0.1)  # Short timeout for responsive queue draining
                     logger.debug(f"Connected to {self.socket_path}")
                     if self.on_connect:
@@ -117,7 +121,7 @@ class HopperConnection:
             # Receive incoming messages (only if connected)
             if sock:
                 try:
-                    data = sock.recv(4096)
+                    data = sock.recv(CLIENT_RECV_CHUNK)
                     if not data:
                         # Connection closed by server
                         logger.debug("Connection closed by server")
@@ -214,22 +218,27 @@ def send_message(
     try:
         sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
         sock.settimeout(timeout)
-        sock.connect(str(socket_path))
+        sock.connect(os.fsencode(socket_path))
 
         line = json.dumps(message) + "\n"
         sock.sendall(line.encode("utf-8"))
 
         if wait_for_response:
-            buffer = ""
+            # Receive straight into one buffer (grown only if needed) and
+            # decode just the framed response line
+            buffer = bytearray(CLIENT_RECV_CHUNK)
+            pos = 0
             while True:
-                data = sock.recv(4096)
-                if not data:
+                if pos == len(buffer):
+                    buffer.extend(bytes(len(buffer)))
+                n = sock.recv_into(memoryview(buffer)[pos:])
+                if not n:
                     break
-                buffer += data.decode("utf-8")
-                if "\n" in buffer:
-                    response_line, _ = buffer.split("\n", 1)
+                newline = buffer.find(b"\n", pos, pos + n)
+                pos += n
+                if newline != -1:
                     sock.close()
-                    return json.loads(response_line)
+                    return json.loads(buffer[:newline])
 
         sock.close()
         return None
@@ -6,11 +6,14 @@
 import json
 import logging
 import os
+import shutil
+import sys
 from pathlib import Path
 
 from hopper import prompt
 from hopper.client import connect, set_lode_state
 from hopper.codex import run_codex
+from hopper.fsutil import atomic_write, fsync_dir
 from hopper.lodes import current_time_ms, format_duration_ms, get_lode_dir
 from hopper.projects import find_project
 
@@ -63,10 +66,10 @@ def run_code(lode_id: str, socket_path: Path, stage_name: str, request: str) ->
     worktree_path = get_lode_dir(lode_id) / "worktree"
     cwd = Path.cwd()
     try:
-        if cwd.resolve() != worktree_path.resolve():
-            print(f"Must run from lode worktree: {worktree_path}")
-            return 1
+        in_worktree = os.path.samefile(cwd, worktree_path)
     except OSError:
+        in_worktree = False
+    if not in_worktree:
         print(f"Must run from lode worktree: {worktree_path}")
         return 1
 
@@ -89,15 +92,16 @@ def run_code(lode_id: str, socket_path: Path, stage_name: str, request: str) ->
         print(f"Prompt not found: prompts/{stage_name}.md")
         return 1
 
-    # Save input prompt
+    # Save input prompt (a plain record of what was sent, so no tmp+rename)
     lode_dir = get_lode_dir(lode_id)
+    lode_dir.mkdir(parents=True, exist_ok=True)
     version = _next_version(lode_dir, stage_name)
     if version is None:
         suffix = stage_name
     else:
         suffix = f"{stage_name}_{version}"
     input_path = lode_dir / f"{suffix}.in.md"
-    _atomic_write(input_path, prompt_text)
+    input_path.write_text(prompt_text)
 
     # Set state to stage name while running
     set_lode_state(socket_path, lode_id, stage_name, f"Running {stage_name}")
@@ -120,7 +124,9 @@ def run_code(lode_id: str, socket_path: Path, stage_name: str, request: str) ->
         "cmd": cmd,
     }
     meta_path = lode_dir / f"{suffix}.json"
-    _atomic_write(meta_path, json.dumps(metadata, indent=2) + "\n")
+    atomic_write(meta_path, (json.dumps(metadata, indent=2) + "\n").encode())
+    # One directory flush covers all of this run's artifact creates and renames
+    fsync_dir(lode_dir)
 
     # Update status with stage result and duration
     duration = format_duration_ms(finished_at - started_at)
@@ -130,11 +136,13 @@ def run_code(lode_id: str, socket_path: Path, stage_name: str, request: str) ->
         status = f"{stage_name} failed after {duration}"
     set_lode_state(socket_path, lode_id, "running", status)
 
-    # Print output if it was written
-    if output_path.exists():
-        content = output_path.read_text()
-        if content:
-            print(content)
+    # Stream output to stdout if it was written, without decoding it into a str
+    if output_path.exists() and output_path.stat().st_size:
+        sys.stdout.flush()
+        with open(output_path, "rb") as f:
+            shutil.copyfileobj(f, sys.stdout.buffer)
+        sys.stdout.buffer.write(b"\n")
+        sys.stdout.buffer.flush()
 
     return exit_code
 
@@ -151,11 +159,3 @@ def _next_version(lode_dir: Path, stage_name: str) -> int | None:
     while (lode_dir / f"{stage_name}_{n}.out.md").exists():
         n += 1
     return n
-
-
-def _atomic_write(path: Path, content: str) -> None:
-    """Write content to a file atomically via tmp + rename."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(content)
-    os.replace(tmp, path)
@@ -10,6 +10,7 @@ import subprocess
 logger = logging.getLogger(__name__)
 
 CODEX_FLAGS = "--dangerously-bypass-approvals-and-sandbox"
+CODEX_EXEC = ("codex", "exec", CODEX_FLAGS)  # Shared argv prefix for every codex call
 
 
 def bootstrap_codex(prompt: str, cwd: str, env: dict | None = None) -> tuple[int, str | None]:
@@ -27,7 +28,7 @@ def bootstrap_codex(prompt: str, cwd: str, env: dict | None = None) -> tuple[int
         (exit_code, thread_id) tuple. thread_id is None on failure.
         Exit code is 127 if codex not found, 130 on KeyboardInterrupt.
     """
-    cmd = ["codex", "exec", CODEX_FLAGS, "--json", prompt]
+    cmd = [*CODEX_EXEC, "--json", prompt]
 
     logger.debug(f"Bootstrapping codex session in {cwd}")
 
@@ -65,16 +66,7 @@ def run_codex(
         (exit_code, cmd) tuple. Exit code is 127 if codex not found,
         130 on KeyboardInterrupt.
     """
-    cmd = [
-        "codex",
-        "exec",
-        CODEX_FLAGS,
-        "-o",
-        output_file,
-        "resume",
-        thread_id,
-        prompt,
-    ]
+    cmd = [*CODEX_EXEC, "-o", output_file, "resume", thread_id, prompt]
 
     logger.debug(f"Running: codex exec resume {thread_id[:8]}... in {cwd}")
 
@@ -3,14 +3,19 @@
 
 """Shared configuration for hopper."""
 
+import functools
 import json
 from pathlib import Path
 
-from platformdirs import user_data_dir
-
 
+@functools.cache
 def hopper_dir() -> Path:
-    """Return the hopper data directory for this user/OS."""
+    """Return the hopper data directory for this user/OS.
+
+    Resolved once per process; platformdirs is imported lazily on first use.
+    """
+    from platformdirs import user_data_dir
+
     return Path(user_data_dir("hopper"))
 
 
@@ -23,36 +23,56 @@ Lodes are plain dicts with these fields:
     {"mill": {"session_id": "<uuid>", "started": false},
      "refine": {"session_id": "<uuid>", "started": false},
      "ship": {"session_id": "<uuid>", "started": false}}
+
+active.jsonl is log-structured: creates and updates append the lode's full
+record, and load_lodes keeps the last record per ID. save_lodes rewrites the
+file compacted, which archiving and periodic compaction rely on.
 """
 
 import json
-import os
 import secrets
 import time
 import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 from hopper import config
+from hopper.fsutil import append_synced, atomic_write, fsync_dir
 
 ID_LEN = 8  # Lode ID length (8 base32 chars)
 ID_ALPHABET = "abcdefghijklmnopqrstuvwxyz234567"  # lowercase base32
 
+COMPACT_MIN_STALE = 64  # Don't compact active.jsonl until this many superseded records
+
+# Superseded records in active.jsonl since it was last loaded or compacted
+_stale_records = 0
+
+# Lode list whose full rewrites are being held back; see deferred_save
+_deferred: list[dict] | None = None
+_deferred_dirty = False
+
+# (file key, IDs) for archived.jsonl; see _archived_ids
+_archived_ids_cache: tuple[tuple, frozenset[str]] | None = None
+
 
 def current_time_ms() -> int:
     """Return current time in milliseconds since epoch."""
     return int(time.time() * 1000)
 
 
-def format_age(timestamp_ms: int) -> str:
+def format_age(timestamp_ms: int, now: int | None = None) -> str:
     """Format a timestamp as a friendly age string.
 
     Args:
         timestamp_ms: Timestamp in milliseconds since epoch
+        now: Current time in ms; pass it when formatting many ages at once
 
     Returns:
         Friendly string like "now", "3m", "4h", "2d", "1w"
     """
-    now = current_time_ms()
+    if now is None:
+        now = current_time_ms()
     diff_ms = now - timestamp_ms
 
     # Handle future timestamps or very recent
@@ -143,18 +163,33 @@ def get_lode_dir(lode_id: str) -> Path:
 
 
 def load_lodes() -> list[dict]:
-    """Load active lodes from JSONL file."""
+    """Load active lodes from JSONL file, keeping the last record per ID."""
+    global _stale_records
+    _stale_records = 0
     lodes_file = config.hopper_dir() / "active.jsonl"
     if not lodes_file.exists():
         return []
 
-    lodes = []
-    with open(lodes_file) as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                lodes.append(json.loads(line))
-    return lodes
+    # Parse raw UTF-8 bytes; json.loads accepts them without a text decode pass
+    lines = lodes_file.read_bytes().split(b"\n")
+    # Every record ends in a newline, so an unterminated tail is a torn append
+    tail = lines.pop()
+    lodes: dict[str, dict] = {}
+    for line in lines:
+        if line.strip():
+            lode = json.loads(line)
+            if lode["id"] in lodes:
+                _stale_records += 1
+            lodes[lode["id"]] = lode
+    if tail.strip():
+        try:
+            lode = json.loads(tail)
+            lodes[lode["id"]] = lode
+        except ValueError:  # Bad JSON, or UTF-8 cut mid-character
+            pass
+        # Rewrite so later appends don't land on the end of the torn line
+        save_lodes(list(lodes.values()))
+    return list(lodes.values())
 
 
 def load_archived_lodes() -> list[dict]:
@@ -162,26 +197,95 @@ def load_archived_lodes() -> list[dict]:
     archived_file = config.hopper_dir() / "archived.jsonl"
     if not archived_file.exists():
         return []
-    lodes = []
-    with open(archived_file) as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                lodes.append(json.loads(line))
-    return lodes
+    return [json.loads(line) for line in archived_file.read_bytes().split(b"\n") if line.strip()]
 
 
 def save_lodes(lodes: list[dict]) -> None:
-    """Atomically save lodes to JSONL file."""
+    """Atomically save lodes to JSONL file, compacting away superseded records.
+
+    Inside deferred_save this only marks the file dirty.
+    """
+    global _stale_records, _deferred_dirty
+    if _deferred is not None:
+        _deferred_dirty = True
+        return
+
     lodes_file = config.hopper_dir() / "active.jsonl"
     lodes_file.parent.mkdir(parents=True, exist_ok=True)
 
-    tmp_path = lodes_file.with_suffix(".jsonl.tmp")
-    with open(tmp_path, "w") as f:
-        for lode in lodes:
-            f.write(json.dumps(lode) + "\n")
+    # Encode everything up front and hand it to the kernel in one write
+    payload = "".join(json.dumps(lode) + "\n" for lode in lodes).encode()
+    atomic_write(lodes_file, payload)
+    fsync_dir(lodes_file.parent)
+    _stale_records = 0
 
-    os.replace(tmp_path, lodes_file)
+
+@contextmanager
+def deferred_save(lodes: list[dict]) -> Iterator[None]:
+    """Coalesce the full rewrites of active.jsonl made inside the block into one.
+
+    For batches that archive or rewrite several lodes in a row: save_lodes
+    calls within the block are held back, and a single save_lodes(lodes) runs
+    on exit if any were made. Appends (create_lode, save_lode) and archive
+    writes still happen immediately. Nested blocks defer to the outermost.
+    """
+    global _deferred, _deferred_dirty
+    if _deferred is not None:
+        yield
+        return
+
+    _deferred = lodes
+    _deferred_dirty = False
+    try:
+        yield
+    finally:
+        _deferred = None
+        if _deferred_dirty:
+            save_lodes(lodes)
+
+
+def save_lode(lodes: list[dict], lode: dict) -> None:
+    """Persist one changed lode by appending its record to active.jsonl.
+
+    Compacts the file via save_lodes once superseded records outnumber the
+    live lodes (and at least COMPACT_MIN_STALE have accrued).
+    """
+    global _stale_records
+    _append_lode(lode)
+    _stale_records += 1
+    if _stale_records >= COMPACT_MIN_STALE and _stale_records > len(lodes):
+        save_lodes(lodes)
+
+
+def _append_lode(lode: dict) -> None:
+    """Append a lode record to active.jsonl and fsync it."""
+    lodes_file = config.hopper_dir() / "active.jsonl"
+    lodes_file.parent.mkdir(parents=True, exist_ok=True)
+    append_synced(lodes_file, (json.dumps(lode) + "\n").encode())
+
+
+def _archived_ids() -> frozenset[str]:
+    """Return the IDs in archived.jsonl, re-parsing only when the file changes.
+
+    The parsed set is cached against the file's path, inode, mtime and size,
+    so repeated lode creation doesn't re-read an ever-growing archive.
+    """
+    global _archived_ids_cache
+    archived_file = config.hopper_dir() / "archived.jsonl"
+    try:
+        st = archived_file.stat()
+    except FileNotFoundError:
+        return frozenset()
+
+    key = (str(archived_file), st.st_ino, st.st_mtime_ns, st.st_size)
+    if _archived_ids_cache is None or _archived_ids_cache[0] != key:
+        ids = frozenset(
+            json.loads(line)["id"]
+            for line in archived_file.read_bytes().split(b"\n")
+            if line.strip()
+        )
+        _archived_ids_cache = (key, ids)
+    return _archived_ids_cache[1]
 
 
 def _generate_lode_id(lodes: list[dict]) -> str:
@@ -190,16 +294,7 @@ def _generate_lode_id(lodes: list[dict]) -> str:
     Checks for collisions against active lodes, archived lodes, and existing
     lode directories.
     """
-    # Load archived IDs for collision check
-    archived_ids: set[str] = set()
-    archived_file = config.hopper_dir() / "archived.jsonl"
-    if archived_file.exists():
-        with open(archived_file) as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    data = json.loads(line)
-                    archived_ids.add(data["id"])
+    archived_ids = _archived_ids()
 
     # Get existing lode directories
     lodes_dir = config.hopper_dir() / "lodes"
@@ -262,7 +357,7 @@ def create_lode(lodes: list[dict], project: str, scope: str = "") -> dict:
     }
     lodes.append(lode)
     get_lode_dir(lode["id"]).mkdir(parents=True, exist_ok=True)
-    save_lodes(lodes)
+    _append_lode(lode)
     return lode
 
 
@@ -272,7 +367,7 @@ def update_lode_stage(lodes: list[dict], lode_id: str, stage: str) -> dict | Non
         if lode["id"] == lode_id:
             lode["stage"] = stage
             touch(lode)
-            save_lodes(lodes)
+            save_lode(lodes, lode)
             return lode
     return None
 
@@ -288,11 +383,10 @@ def archive_lode(lodes: list[dict], lode_id: str) -> dict | None:
         if lode["id"] == lode_id:
             archived = lodes.pop(i)
 
-            # Append to archive file
+            # Append to archive file (fsynced before active.jsonl drops the lode)
             archived_file = config.hopper_dir() / "archived.jsonl"
             archived_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(archived_file, "a") as f:
-                f.write(json.dumps(archived) + "\n")
+            append_synced(archived_file, (json.dumps(archived) + "\n").encode())
 
             save_lodes(lodes)
             return archived
@@ -306,7 +400,7 @@ def update_lode_state(lodes: list[dict], lode_id: str, state: str, status: str)
             lode["state"] = state
             lode["status"] = status
             touch(lode)
-            save_lodes(lodes)
+            save_lode(lodes, lode)
             return lode
     return None
 
@@ -317,7 +411,7 @@ def update_lode_status(lodes: list[dict], lode_id: str, status: str) -> dict | N
         if lode["id"] == lode_id:
             lode["status"] = status
             touch(lode)
-            save_lodes(lodes)
+            save_lode(lodes, lode)
             return lode
     return None
 
@@ -328,7 +422,7 @@ def update_lode_title(lodes: list[dict], lode_id: str, title: str) -> dict | Non
         if lode["id"] == lode_id:
             lode["title"] = title
             touch(lode)
-            save_lodes(lodes)
+            save_lode(lodes, lode)
             return lode
     return None
 
@@ -339,7 +433,7 @@ def update_lode_auto(lodes: list[dict], lode_id: str, auto: bool) -> dict | None
         if lode["id"] == lode_id:
             lode["auto"] = auto
             touch(lode)
-            save_lodes(lodes)
+            save_lode(lodes, lode)
             return lode
     return None
 
@@ -350,7 +444,7 @@ def update_lode_codex_thread(lodes: list[dict], lode_id: str, codex_thread_id: s
         if lode["id"] == lode_id:
             lode["codex_thread_id"] = codex_thread_id
             touch(lode)
-            save_lodes(lodes)
+            save_lode(lodes, lode)
             return lode
     return None
 
@@ -363,7 +457,7 @@ def set_lode_claude_started(lodes: list[dict], lode_id: str, claude_stage: str)
                 return None
             lode["claude"][claude_stage]["started"] = True
             touch(lode)
-            save_lodes(lodes)
+            save_lode(lodes, lode)
             return lode
     return None
 
@@ -377,6 +471,6 @@ def reset_lode_claude_stage(lodes: list[dict], lode_id: str, claude_stage: str)
             lode["claude"][claude_stage]["session_id"] = str(uuid.uuid4())
             lode["claude"][claude_stage]["started"] = False
             touch(lode)
-            save_lodes(lodes)
+            save_lode(lodes, lode)
             return lode
     return None
@@ -105,6 +105,7 @@ class ProcessRunner(BaseRunner):
         self._cwd: str | None = None
         self.worktree_path: Path | None = None
         self.use_venv: bool = False
+        self._env: dict | None = None  # Built once by _get_subprocess_env
         self.scope: str = ""
         self.stage: str = ""
 
@@ -293,11 +294,16 @@ class ProcessRunner(BaseRunner):
         os.replace(tmp, path)
 
     def _get_subprocess_env(self) -> dict:
-        """Build environment with venv activated if applicable."""
-        base_env = super()._get_subprocess_env()
-        if self.use_venv and self.worktree_path:
-            return _get_venv_env(self.worktree_path, base_env)
-        return base_env
+        """Build environment with venv activated if applicable.
+
+        Built once after setup and shared by the Codex bootstrap and Claude run.
+        """
+        if self._env is None:
+            env = super()._get_subprocess_env()
+            if self.use_venv and self.worktree_path:
+                env = _get_venv_env(self.worktree_path, env)
+            self._env = env
+        return self._env
 
     def _build_command(self) -> tuple[list[str], str | None]:
         skip = "--dangerously-skip-permissions"
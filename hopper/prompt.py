@@ -63,11 +63,10 @@ def load(name: str, context: dict[str, str] | None = None) -> str:
     if not name.endswith(".md"):
         name = f"{name}.md"
 
-    path = PROMPTS_DIR / name
-    if not path.exists():
-        raise FileNotFoundError(f"Prompt not found: {name}")
-
-    text = path.read_text().strip()
+    try:
+        text = (PROMPTS_DIR / name).read_text().strip()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Prompt not found: {name}") from None
     template_vars = _build_template_vars(context)
 
     return Template(text).safe_substitute(template_vars)
@@ -3,24 +3,35 @@
 
 """Base runner - shared lifecycle logic for the process runner."""
 
+import hashlib
 import logging
 import os
 import signal
 import subprocess
 import sys
 import threading
+from collections import deque
 from pathlib import Path
 
 from hopper.client import HopperConnection, connect
 from hopper.lodes import current_time_ms
 from hopper.projects import find_project
-from hopper.tmux import capture_pane, get_current_pane_id, rename_window, send_keys
+from hopper.tmux import (
+    capture_pane,
+    get_current_pane_id,
+    get_pane_digest,
+    get_pane_status,
+    rename_window,
+    send_keys,
+)
 
 logger = logging.getLogger(__name__)
 
 ERROR_LINES = 5  # Number of stderr lines to capture on error
+STDERR_TAIL_LINES = 50  # Lines of stderr retained while draining the pipe
 MONITOR_INTERVAL = 5.0  # Seconds between activity checks
 MONITOR_INTERVAL_MS = int(MONITOR_INTERVAL * 1000)
+MONITOR_MAX_INTERVAL = 10.0  # Stuck-state interval cap; bounds how long resumed output shows stuck
 
 
 def extract_error_message(stderr_bytes: bytes) -> str | None:
@@ -44,6 +55,22 @@ def extract_error_message(stderr_bytes: bytes) -> str | None:
     return "\n".join(tail)
 
 
+def drain_stderr(stream, tail: deque) -> None:
+    """Read a stderr pipe until EOF, keeping only the most recent lines.
+
+    Runs on its own thread so the child never blocks on a full pipe buffer.
+
+    Args:
+        stream: Binary pipe to read from
+        tail: Bounded deque that receives each line
+    """
+    try:
+        for line in stream:
+            tail.append(line)
+    except (OSError, ValueError):
+        pass  # Pipe closed underneath us
+
+
 class BaseRunner:
     """Base class for lode runners.
 
@@ -74,7 +101,9 @@ class BaseRunner:
         # Activity monitor state
         self._monitor_thread: threading.Thread | None = None
         self._monitor_stop = threading.Event()
-        self._last_snapshot: str | None = None
+        self._wake = threading.Event()  # Set on done or monitor stop, wakes the dismiss thread
+        self._last_digest: str | None = None
+        self._last_hash: bytes | None = None  # Hash of the last captured pane contents
         self._stuck_since: int | None = None
         self._pane_id: str | None = None
         # Completion tracking
@@ -222,6 +251,18 @@ class BaseRunner:
         try:
             proc = subprocess.Popen(cmd, env=env, stderr=subprocess.PIPE, cwd=cwd)
 
+            # Drain stderr while Claude runs, keeping a bounded tail for errors
+            stderr_tail: deque[bytes] = deque(maxlen=STDERR_TAIL_LINES)
+            stderr_thread = None
+            if proc.stderr:
+                stderr_thread = threading.Thread(
+                    target=drain_stderr,
+                    args=(proc.stderr, stderr_tail),
+                    name="stderr-drain",
+                    daemon=True,
+                )
+                stderr_thread.start()
+
             self._emit_state("running", "Claude running")
             self._start_monitor()
 
@@ -236,9 +277,12 @@ class BaseRunner:
 
             proc.wait()
 
+            if stderr_thread:
+                # Bounded: a lingering grandchild may still hold the pipe open
+                stderr_thread.join(timeout=1.0)
+
             if proc.returncode != 0 and proc.stderr:
-                stderr_bytes = proc.stderr.read()
-                error_msg = extract_error_message(stderr_bytes)
+                error_msg = extract_error_message(b"".join(stderr_tail))
                 return proc.returncode, error_msg
 
             return proc.returncode, None
@@ -295,13 +339,16 @@ class BaseRunner:
             return
         if lode.get("state") == "completed":
             self._done.set()
+            self._wake.set()
             logger.debug(f"{self._done_label} signal received")
 
     def _wait_and_dismiss_claude(self) -> None:
         """Wait for completion, screen stability, then send Ctrl-D to exit Claude."""
-        while not self._done.wait(timeout=1.0):
+        # Sleep until completion or monitor stop, with no periodic wakeups
+        while not self._done.is_set():
             if self._monitor_stop.is_set():
                 return
+            self._wake.wait()
 
         if not self._pane_id:
             return
@@ -322,8 +369,7 @@ class BaseRunner:
             return
 
         logger.debug("Screen stable, sending Ctrl-D")
-        send_keys(self._pane_id, "C-d")
-        send_keys(self._pane_id, "C-d")
+        send_keys(self._pane_id, "C-d", "C-d")
 
     def _start_monitor(self) -> None:
         """Start the activity monitor thread."""
@@ -334,6 +380,8 @@ class BaseRunner:
 
         rename_window(self._pane_id, self.lode_id)
         self._monitor_stop.clear()
+        if not self._done.is_set():
+            self._wake.clear()
         self._monitor_thread = threading.Thread(
             target=self._monitor_loop, name="activity-monitor", daemon=True
         )
@@ -343,14 +391,28 @@ class BaseRunner:
     def _stop_monitor(self) -> None:
         """Stop the activity monitor thread."""
         if self._monitor_thread and self._monitor_thread.is_alive():
-            self._monitor_stop.set()
+            self._halt_monitor()
             self._monitor_thread.join(timeout=1.0)
             logger.debug("Stopped activity monitor")
 
+    def _halt_monitor(self) -> None:
+        """Signal the monitor and any waiting dismiss thread to stop."""
+        self._monitor_stop.set()
+        self._wake.set()
+
     def _monitor_loop(self) -> None:
-        """Monitor loop that checks for activity every MONITOR_INTERVAL seconds."""
-        while not self._monitor_stop.wait(MONITOR_INTERVAL):
+        """Monitor loop that checks for activity every MONITOR_INTERVAL seconds.
+
+        While the pane is stuck the interval doubles up to MONITOR_MAX_INTERVAL,
+        so an idle session waiting on the user rarely touches tmux.
+        """
+        interval = MONITOR_INTERVAL
+        while not self._monitor_stop.wait(interval):
             self._check_activity()
+            if self._stuck_since is None:
+                interval = MONITOR_INTERVAL
+            else:
+                interval = min(interval * 2, MONITOR_MAX_INTERVAL)
 
     def _check_activity(self) -> None:
         """Check tmux pane for activity and update state accordingly."""
@@ -361,20 +423,40 @@ class BaseRunner:
         if self._done.is_set():
             return
 
-        snapshot = capture_pane(self._pane_id)
-        if snapshot is None:
+        # While the pane is active it will likely have changed, so fetch the
+        # digest and contents together; once idle, only capture when the
+        # cheap digest says something changed
+        if self._stuck_since is not None:
+            digest = get_pane_digest(self._pane_id)
+            if digest is None:
+                logger.debug("Failed to query pane, stopping monitor")
+                self._halt_monitor()
+                return
+            if digest == self._last_digest:
+                self._report_stuck()
+                return
+
+        status = get_pane_status(self._pane_id)
+        if status is None:
             logger.debug("Failed to capture pane, stopping monitor")
-            self._monitor_stop.set()
+            self._halt_monitor()
             return
+        self._last_digest, contents = status
 
-        if snapshot == self._last_snapshot:
-            now = current_time_ms()
-            if self._stuck_since is None:
-                self._stuck_since = now - MONITOR_INTERVAL_MS
-            duration_sec = (now - self._stuck_since) // 1000
-            self._emit_state("stuck", f"No output for {duration_sec}s")
+        # Compare an 8-byte hash rather than holding on to the full pane text
+        pane_hash = hashlib.blake2b(contents, digest_size=8).digest()
+        if pane_hash == self._last_hash:
+            self._report_stuck()
         else:
             if self._stuck_since is not None:
                 self._emit_state("running", "Claude running")
             self._stuck_since = None
-            self._last_snapshot = snapshot
+            self._last_hash = pane_hash
+
+    def _report_stuck(self) -> None:
+        """Record and emit how long the pane has gone without output."""
+        now = current_time_ms()
+        if self._stuck_since is None:
+            self._stuck_since = now - MONITOR_INTERVAL_MS
+        duration_sec = (now - self._stuck_since) // 1000
+        self._emit_state("stuck", f"No output for {duration_sec}s")
@@ -4,14 +4,17 @@
 """Unix socket JSONL server for hopper."""
 
 import atexit
+import itertools
 import json
 import logging
 import queue
+import selectors
 import signal
 import socket
 import subprocess
 import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
 
 from hopper import config
@@ -31,10 +34,12 @@ from hopper.lodes import (
     archive_lode,
     create_lode,
     current_time_ms,
+    deferred_save,
     get_lode_dir,
     load_archived_lodes,
     load_lodes,
     reset_lode_claude_stage,
+    save_lode,
     save_lodes,
     set_lode_claude_started,
     touch,
@@ -50,6 +55,15 @@ from hopper.projects import Project, find_project, get_active_projects
 
 logger = logging.getLogger(__name__)
 
+# Pre-encoded pong; the timestamp is the only field that varies
+_PONG = b'{"type": "pong", "ts": %d}\n'
+
+SERVER_RECV_CHUNK = 8192  # Bytes per client read
+BROADCAST_PENDING_MAX = 10000  # Pending broadcasts before new ones are dropped
+BROADCAST_BATCH_MAX = 256  # Messages per writer batch; keeps sendmsg under IOV_MAX
+OUTBOX_HIGH_WATER = 1 << 20  # Unsent broadcast bytes a client may fall behind before cut off
+STOP_FLUSH_TIMEOUT = 0.5  # Seconds stop() lets clients drain their outbox before closing
+
 
 def get_git_hash() -> str | None:
     """Get the short git hash of the current HEAD."""
@@ -69,8 +83,9 @@ def get_git_hash() -> str | None:
 class Server:
     """Broadcast message server over Unix domain socket.
 
-    Uses a single writer thread to serialize all broadcasts, preventing
-    race conditions when multiple client handler threads send concurrently.
+    A single reactor (the thread running start()) accepts and reads every
+    client via selectors. A single writer thread serializes all broadcasts,
+    and an event loop thread serializes all state mutations.
 
     Tracks which clients own which lodes. Sets active=False and clears
     tmux_pane and pid on disconnect; state/status are client-driven.
@@ -81,11 +96,31 @@ class Server:
         self.tmux_location = tmux_location
         self.git_hash = get_git_hash()
         self.started_at = current_time_ms()
-        self.clients: list[socket.socket] = []
-        self.lock = threading.RLock()
+        # Copy-on-write: replaced wholesale under self.lock, read without it
+        self.clients: tuple[socket.socket, ...] = ()
+        self.lock = threading.Lock()
         self.stop_event = threading.Event()
         self.server_socket: socket.socket | None = None
-        self.broadcast_queue: queue.Queue = queue.Queue(maxsize=10000)
+        # Reactor state, created by start(); other threads write to _wake_w to wake it
+        self._selector: selectors.BaseSelector | None = None
+        self._wake_r: socket.socket | None = None
+        self._wake_w: socket.socket | None = None
+        # Clients the reactor watches for EVENT_WRITE to flush their outbox
+        self._write_armed: set[socket.socket] = set()
+        self._recv_view: memoryview | None = None
+        # Pending broadcasts in send order. lode_updated messages are keyed by
+        # lode ID so a newer update replaces one still waiting to go out.
+        self._pending: OrderedDict = OrderedDict()
+        self._pending_cond = threading.Condition()
+        self._pending_seq = itertools.count()
+        # Unsent bytes per client; sends never block, so a slow client only
+        # backs up here instead of stalling the writer. The reactor flushes
+        # them as the socket becomes writable.
+        self._outbox: dict[socket.socket, bytearray] = {}
+        # Outbox bytes from direct responses, which don't count toward
+        # OUTBOX_HIGH_WATER (treated as the tail still to go out)
+        self._outbox_exempt: dict[socket.socket, int] = {}
+        self._outbox_lock = threading.Lock()
         self.event_queue: queue.Queue = queue.Queue(maxsize=10000)
         self.writer_thread: threading.Thread | None = None
         self.event_thread: threading.Thread | None = None
@@ -93,6 +128,11 @@ class Server:
         self.archived_lodes: list[dict] = []
         self.backlog: list[BacklogItem] = []
         self.projects: list[Project] = []
+        # Bumped by the event loop after each mutation so in-process readers
+        # (the TUI) can tell when the lists above may have changed
+        self.state_version = 0
+        # Set once the socket is listening and the worker threads are running
+        self.ready = threading.Event()
         # Lode ownership tracking: lode_id -> socket, socket -> lode_id
         self.lode_clients: dict[str, socket.socket] = {}
         self.client_lodes: dict[socket.socket, str] = {}
@@ -123,25 +163,27 @@ class Server:
         self.backlog = load_backlog()
         self.projects = get_active_projects()
 
-        # Clear stale active flags from previous run (no clients connected yet)
-        stale = False
-        for lode in self.lodes:
-            if lode.get("active") or lode.get("tmux_pane") or lode.get("pid"):
-                lode["active"] = False
-                lode["tmux_pane"] = None
-                lode["pid"] = None
-                stale = True
-        if stale:
-            save_lodes(self.lodes)
-
-        # Auto-archive any shipped lodes left over from before auto-archive existed
-        shipped = [lode for lode in self.lodes if lode.get("stage") == "shipped"]
-        for lode in shipped:
-            archived = archive_lode(self.lodes, lode["id"])
-            if archived:
-                self.archived_lodes.append(archived)
-                logger.info(f"Startup: auto-archived shipped lode {lode['id']}")
-                self._cleanup_worktree(archived)
+        # Startup cleanup rewrites active.jsonl once, however many lodes it touches
+        with deferred_save(self.lodes):
+            # Clear stale active flags from previous run (no clients connected yet)
+            stale = False
+            for lode in self.lodes:
+                if lode.get("active") or lode.get("tmux_pane") or lode.get("pid"):
+                    lode["active"] = False
+                    lode["tmux_pane"] = None
+                    lode["pid"] = None
+                    stale = True
+            if stale:
+                save_lodes(self.lodes)
+
+            # Auto-archive any shipped lodes left over from before auto-archive existed
+            shipped = [lode for lode in self.lodes if lode.get("stage") == "shipped"]
+            for lode in shipped:
+                archived = archive_lode(self.lodes, lode["id"])
+                if archived:
+                    self.archived_lodes.append(archived)
+                    logger.info(f"Startup: auto-archived shipped lode {lode['id']}")
+                    self._cleanup_worktree(archived)
 
         # Remove stale socket file
         if self.socket_path.exists():
@@ -150,7 +192,15 @@ class Server:
         self.server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
         self.server_socket.bind(str(self.socket_path))
         self.server_socket.listen(5)
-        self.server_socket.settimeout(1.0)
+        self.server_socket.setblocking(False)
+
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._recv_view = memoryview(bytearray(SERVER_RECV_CHUNK))
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self.server_socket, selectors.EVENT_READ)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
 
         # Start writer thread (serializes broadcasts)
         self.writer_thread = threading.Thread(
@@ -165,18 +215,30 @@ class Server:
         self.event_thread.start()
 
         logger.info(f"Server listening on {self.socket_path}")
+        self.ready.set()
 
         try:
             while not self.stop_event.is_set():
-                try:
-                    conn, _ = self.server_socket.accept()
-                    threading.Thread(target=self._handle_client, args=(conn,), daemon=True).start()
-                except socket.timeout:
-                    continue
-                except Exception as e:
-                    if not self.stop_event.is_set():
-                        logger.error(f"Accept error: {e}")
+                for key, events in self._selector.select():
+                    if key.fileobj is self.server_socket:
+                        self._accept_client()
+                    elif key.fileobj is self._wake_r:
+                        try:
+                            self._wake_r.recv(64)
+                        except BlockingIOError:
+                            pass
+                        self._arm_writes()
+                    else:
+                        # Flush first: a failed send shuts the client down,
+                        # and the read then sees EOF and drops it
+                        if events & selectors.EVENT_WRITE:
+                            self._write_client(key.fileobj)
+                        if events & selectors.EVENT_READ:
+                            self._read_client(key.fileobj, key.data)
         finally:
+            self._selector.close()
+            self._wake_r.close()
+            self._wake_w.close()
             self.server_socket.close()
             if self.socket_path.exists():
                 self.socket_path.unlink()
@@ -184,53 +246,112 @@ class Server:
     # Message types that only read state and send a response (safe from any thread)
     _READ_ONLY_TYPES = frozenset({"connect", "ping", "lode_list", "backlog_list", "archived_list"})
 
-    def _handle_client(self, conn: socket.socket) -> None:
-        """Handle a client connection.
+    def _accept_client(self) -> None:
+        """Accept a pending connection and register it with the reactor."""
+        try:
+            conn, _ = self.server_socket.accept()
+        except OSError as e:
+            if not self.stop_event.is_set() and not isinstance(e, BlockingIOError):
+                logger.error(f"Accept error: {e}")
+            return
 
-        Read-only messages are handled inline. Mutations are enqueued
-        to the event loop thread for serialized processing.
-        """
+        # Non-blocking: reads follow selector readiness, sends go via the outbox
+        conn.setblocking(False)
+        self._selector.register(conn, selectors.EVENT_READ, bytearray())
         with self.lock:
-            self.clients.append(conn)
+            self.clients += (conn,)
 
         logger.debug(f"Client connected ({len(self.clients)} total)")
 
+    def _read_client(self, conn: socket.socket, buffer: bytearray) -> None:
+        """Read available data from a client and dispatch complete lines.
+
+        Read-only messages are handled inline. Mutations are enqueued
+        to the event loop thread for serialized processing.
+        """
         try:
-            conn.settimeout(2.0)
-            buffer = ""
-            while not self.stop_event.is_set():
-                try:
-                    data = conn.recv(4096)
-                    if not data:
-                        break
-
-                    buffer += data.decode("utf-8")
-                    while "\n" in buffer:
-                        line, buffer = buffer.split("\n", 1)
-                        if line.strip():
-                            try:
-                                message = json.loads(line)
-                                msg_type = message.get("type")
-                                if msg_type in self._READ_ONLY_TYPES:
-                                    self._handle_read_only(message, conn)
-                                else:
-                                    self._enqueue_event(message, conn)
-                            except json.JSONDecodeError:
-                                pass
-                except socket.timeout:
-                    continue
-        except Exception as e:
+            n = conn.recv_into(self._recv_view)
+        except BlockingIOError:
+            return
+        except OSError as e:
             logger.debug(f"Client error: {e}")
-        finally:
-            self._enqueue_event({"type": "_client_disconnect"}, conn)
-            with self.lock:
-                if conn in self.clients:
-                    self.clients.remove(conn)
+            n = 0
+        if not n:
+            self._drop_client(conn)
+            return
+
+        # Frame on raw bytes; json.loads decodes each complete line itself.
+        # Consumed lines are deleted from the per-client buffer in place.
+        buffer += self._recv_view[:n]
+        start = 0
+        while (newline := buffer.find(b"\n", start)) != -1:
+            line = buffer[start:newline]
+            start = newline + 1
+            if not line.strip():
+                continue
             try:
-                conn.close()
+                message = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if not isinstance(message, dict):
+                continue
+            try:
+                if message.get("type") in self._READ_ONLY_TYPES:
+                    self._handle_read_only(message, conn)
+                else:
+                    self._enqueue_event(message, conn)
             except Exception:
-                pass
-            logger.debug(f"Client disconnected ({len(self.clients)} remaining)")
+                # Drop only the offending client; the reactor keeps serving the rest
+                logger.exception(f"Client message error: {message.get('type')}")
+                self._drop_client(conn)
+                return
+        del buffer[:start]
+
+    def _arm_writes(self) -> None:
+        """Watch clients with a new outbox for writability. Reactor thread only."""
+        with self._outbox_lock:
+            waiting = [conn for conn in self._outbox if conn not in self._write_armed]
+        for conn in waiting:
+            try:
+                key = self._selector.get_key(conn)
+            except (KeyError, ValueError):
+                continue  # Already dropped
+            self._selector.modify(conn, selectors.EVENT_READ | selectors.EVENT_WRITE, key.data)
+            self._write_armed.add(conn)
+
+    def _write_client(self, conn: socket.socket) -> None:
+        """Flush a writable client's outbox; stop watching once it's empty."""
+        if not self._send_frames(conn, []):
+            self._shutdown_client(conn)
+            return
+        with self._outbox_lock:
+            if conn in self._outbox:
+                return
+        self._write_armed.discard(conn)
+        key = self._selector.get_key(conn)
+        self._selector.modify(conn, selectors.EVENT_READ, key.data)
+
+    def _drop_client(self, conn: socket.socket) -> None:
+        """Unregister a client from the reactor and close it. Reactor thread only."""
+        try:
+            self._selector.unregister(conn)
+        except (KeyError, ValueError):
+            pass
+        self._write_armed.discard(conn)
+        self._enqueue_event({"type": "_client_disconnect"}, conn)
+        self._remove_clients([conn])
+        logger.debug(f"Client disconnected ({len(self.clients)} remaining)")
+
+    def _shutdown_client(self, conn: socket.socket) -> None:
+        """Cut off a client from another thread.
+
+        The reactor then sees EOF and drops it, so the socket is never closed
+        while still registered with the selector.
+        """
+        try:
+            conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
 
     def _on_client_disconnect(self, conn: socket.socket) -> None:
         """Handle client disconnect - deactivate lode, auto-advance, or auto-archive.
@@ -256,7 +377,7 @@ class Server:
         lode["tmux_pane"] = None
         lode["pid"] = None
         touch(lode)
-        save_lodes(self.lodes)
+        save_lode(self.lodes, lode)
 
         logger.info(f"Lode {lode_id} disconnected, active=False")
         self.broadcast({"type": "lode_updated", "lode": lode})
@@ -320,10 +441,7 @@ class Server:
             old_lode_id = self.client_lodes.pop(existing_conn, None)
             if old_lode_id:
                 self.lode_clients.pop(old_lode_id, None)
-            try:
-                existing_conn.close()
-            except Exception:
-                pass
+            self._shutdown_client(existing_conn)
             logger.debug(f"Disconnected stale client for lode {lode_id}")
 
         # Register new owner
@@ -339,7 +457,7 @@ class Server:
             if pid:
                 lode["pid"] = pid
             touch(lode)
-            save_lodes(self.lodes)
+            save_lode(self.lodes, lode)
             self.broadcast({"type": "lode_updated", "lode": lode})
 
         logger.info(f"Registered client for lode {lode_id}, active=True")
@@ -361,7 +479,8 @@ class Server:
             self._send_response(conn, response)
 
         elif msg_type == "ping":
-            self._send_response(conn, {"type": "pong"})
+            if not self._send_frames(conn, [_PONG % current_time_ms()]):
+                self._shutdown_client(conn)
 
         elif msg_type == "lode_list":
             self._send_response(conn, {"type": "lode_list", "lodes": self.lodes})
@@ -396,7 +515,7 @@ class Server:
             backlog_data = message.get("backlog")
             if backlog_data:
                 lode["backlog"] = backlog_data
-                save_lodes(self.lodes)
+                save_lode(self.lodes, lode)
             logger.info(f"Lode {lode['id']} created project={project}")
             self.broadcast({"type": "lode_created", "lode": lode})
             if conn:
@@ -519,7 +638,7 @@ class Server:
             if item:
                 lode = create_lode(self.lodes, item.project, scope)
                 lode["backlog"] = item.to_dict()
-                save_lodes(self.lodes)
+                save_lode(self.lodes, lode)
                 logger.info(f"Lode {lode['id']} promoted from backlog {item.id}")
                 self.broadcast({"type": "lode_created", "lode": lode})
                 remove_backlog_item(self.backlog, item.id)
@@ -566,11 +685,9 @@ class Server:
         """Send a response directly to a client."""
         if "ts" not in message:
             message["ts"] = current_time_ms()
-        response = json.dumps(message) + "\n"
-        try:
-            conn.sendall(response.encode("utf-8"))
-        except Exception as e:
-            logger.debug(f"Failed to send response: {e}")
+        response = (json.dumps(message) + "\n").encode("utf-8")
+        if not self._send_frames(conn, [response], direct=True):
+            self._shutdown_client(conn)
 
     def _event_loop(self) -> None:
         """Dedicated thread that serializes all state mutations.
@@ -588,6 +705,7 @@ class Server:
                 self._handle_mutation(message, conn)
             except Exception:
                 logger.exception(f"Event loop error: {message.get('type')}")
+            self.state_version += 1
 
     def _enqueue_event(self, message: dict, conn: socket.socket | None = None) -> None:
         """Enqueue a mutation event for the event loop thread."""
@@ -601,56 +719,155 @@ class Server:
         self._enqueue_event(message)
 
     def _writer_loop(self) -> None:
-        """Dedicated writer thread that serializes all broadcasts."""
-        while not self.stop_event.is_set():
-            try:
-                message = self.broadcast_queue.get(timeout=0.1)
-            except queue.Empty:
-                continue
+        """Dedicated writer thread that serializes all broadcasts.
 
-            self._send_to_clients(message)
-
-    def _send_to_clients(self, message: dict) -> None:
-        """Send a message to all connected clients."""
-        if "ts" not in message:
-            message["ts"] = current_time_ms()
-
-        data = (json.dumps(message) + "\n").encode("utf-8")
-
-        with self.lock:
-            clients_to_send = list(self.clients)
-
-        dead_clients = []
-        for client in clients_to_send:
+        Takes everything pending at wake-up so a burst of updates goes out
+        in one send per client rather than one per message. Leftover bytes
+        are flushed by the reactor, so the writer only wakes for new messages.
+        """
+        while True:
+            with self._pending_cond:
+                while not self._pending and not self.stop_event.is_set():
+                    self._pending_cond.wait()
+                if self.stop_event.is_set():
+                    return
+                batch = []
+                while self._pending and len(batch) < BROADCAST_BATCH_MAX:
+                    batch.append(self._pending.popitem(last=False)[1])
+
+            self._send_to_clients(*batch)
+
+    def _send_to_clients(self, *messages: dict) -> None:
+        """Send messages to all connected clients, encoding each only once."""
+        now = current_time_ms()
+        frames = []
+        for message in messages:
+            if "ts" not in message:
+                message["ts"] = now
+            frames.append((json.dumps(message) + "\n").encode("utf-8"))
+
+        for client in self.clients:
+            if not self._send_frames(client, frames):
+                self._shutdown_client(client)
+
+    def _send_frames(self, conn: socket.socket, frames: list[bytes], direct: bool = False) -> bool:
+        """Send frames to one client without blocking.
+
+        Whatever the socket won't take now is kept in the client's outbox,
+        behind any bytes already waiting there, and the reactor is woken to
+        flush it once the socket is writable. Returns False if the client is
+        dead or has fallen more than OUTBOX_HIGH_WATER bytes of broadcasts
+        behind; direct responses (a reply the client asked for) are exempt
+        from that limit.
+        """
+        with self._outbox_lock:
+            pending = self._outbox.pop(conn, None)
+            created = pending is None
+            exempt = self._outbox_exempt.pop(conn, 0)
             try:
-                client.settimeout(2.0)
-                client.sendall(data)
-            except Exception as e:
-                logger.debug(f"Failed to send to client: {e}")
-                dead_clients.append(client)
-
-        if dead_clients:
-            with self.lock:
-                for client in dead_clients:
-                    if client in self.clients:
-                        self.clients.remove(client)
+                if pending is None:
+                    total = sum(len(frame) for frame in frames)
+                    try:
+                        sent = conn.sendmsg(frames)
+                    except BlockingIOError:
+                        sent = 0
+                    if sent == total:
+                        return True
+                    pending = bytearray(b"".join(frames)[sent:])
+                else:
+                    for frame in frames:
+                        pending += frame
                     try:
-                        client.close()
-                    except Exception:
-                        pass
+                        sent = conn.send(pending)
+                    except BlockingIOError:
+                        sent = 0
+                    del pending[:sent]
+            except OSError as e:
+                logger.debug(f"Failed to send to client: {e}")
+                return False
+
+            if direct:
+                exempt += sum(len(frame) for frame in frames)
+            exempt = min(exempt, len(pending))
+            if len(pending) - exempt > OUTBOX_HIGH_WATER:
+                logger.warning(f"Client {len(pending)} bytes behind, disconnecting")
+                return False
+            if not pending:
+                return True
+            self._outbox[conn] = pending
+            if exempt:
+                self._outbox_exempt[conn] = exempt
+
+        if created:
+            self._wake_reactor()
+        return True
+
+    def _wake_reactor(self) -> None:
+        """Interrupt the reactor's select so it picks up new outboxes or stop."""
+        if self._wake_w:
+            try:
+                self._wake_w.send(b"\0")
+            except OSError:
+                pass  # Closed by stop, or already full of pending wake-ups
+
+    def _drain_outboxes(self, timeout: float) -> None:
+        """Flush outboxes as clients become writable, for at most timeout seconds."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._outbox_lock:
+                waiting = list(self._outbox)
+            for conn in waiting:
+                if not self._send_frames(conn, []):
+                    self._shutdown_client(conn)
+            with self._outbox_lock:
+                waiting = [conn for conn in waiting if conn in self._outbox]
+            remaining = deadline - time.monotonic()
+            if not waiting or remaining <= 0:
+                return
+            with selectors.DefaultSelector() as sel:
+                for conn in waiting:
+                    sel.register(conn, selectors.EVENT_WRITE)
+                sel.select(remaining)
+
+    def _remove_clients(self, dead: list[socket.socket]) -> None:
+        """Drop clients from the published tuple and close their sockets."""
+        with self.lock:
+            self.clients = tuple(c for c in self.clients if c not in dead)
+        with self._outbox_lock:
+            for client in dead:
+                self._outbox.pop(client, None)
+                self._outbox_exempt.pop(client, None)
+        for client in dead:
+            try:
+                client.close()
+            except Exception:
+                pass
 
     def broadcast(self, message: dict) -> bool:
-        """Queue message for broadcast to all connected clients."""
+        """Queue message for broadcast to all connected clients.
+
+        A lode_updated message replaces any pending update for the same lode.
+        The lode dict is live, so the older entry would have serialized the
+        same state anyway.
+        """
         if "type" not in message:
             logger.warning("Skipping message without type field")
             return False
 
-        try:
-            self.broadcast_queue.put_nowait(message)
-            return True
-        except queue.Full:
-            logger.warning(f"Broadcast queue full, dropping: {message.get('type')}")
-            return False
+        if message["type"] == "lode_updated" and message.get("lode"):
+            key = ("lode_updated", message["lode"]["id"])
+        else:
+            key = next(self._pending_seq)
+
+        with self._pending_cond:
+            if key in self._pending:
+                del self._pending[key]  # Re-insert at the end to keep send order
+            elif len(self._pending) >= BROADCAST_PENDING_MAX:
+                logger.warning(f"Broadcast queue full, dropping: {message.get('type')}")
+                return False
+            self._pending[key] = message
+            self._pending_cond.notify()
+        return True
 
     def stop(self) -> None:
         """Stop the server gracefully.
@@ -661,20 +878,19 @@ class Server:
 
         # Send shutdown message to all clients (bypass queue for immediate delivery)
         self._send_to_clients({"type": "shutdown"})
+        # Give slow clients a moment to take it, along with anything queued ahead
+        self._drain_outboxes(STOP_FLUSH_TIMEOUT)
 
         # Close all client connections
-        with self.lock:
-            for client in self.clients:
-                try:
-                    client.close()
-                except Exception:
-                    pass
-            self.clients.clear()
-
-        # Signal threads to stop
+        self._remove_clients(list(self.clients))
+
+        # Signal threads to stop and wake the reactor and writer
         self.stop_event.set()
+        with self._pending_cond:
+            self._pending_cond.notify_all()
+        self._wake_reactor()
 
-        # Close server socket to unblock accept()
+        # Close server socket
         if self.server_socket:
             try:
                 self.server_socket.close()
@@ -735,11 +951,7 @@ def start_server_with_tui(socket_path: Path, tmux_location: dict | None = None)
     server_thread.start()
 
     # Wait for socket to be ready
-    for _ in range(50):
-        if socket_path.exists():
-            break
-        time.sleep(0.1)
-    else:
+    if not server.ready.wait(timeout=5.0):
         print("Server failed to start")
         server.stop()
         return 1
@@ -9,6 +9,9 @@ import subprocess
 
 logger = logging.getLogger(__name__)
 
+# Fields that change whenever a pane produces output (window_activity is a timestamp)
+PANE_DIGEST_FORMAT = "#{history_size}|#{cursor_x}|#{cursor_y}|#{alternate_on}|#{window_activity}"
+
 
 def is_inside_tmux() -> bool:
     """Check if currently running inside a tmux session."""
@@ -154,19 +157,19 @@ def get_current_pane_id() -> str | None:
     return os.environ.get("TMUX_PANE") or None
 
 
-def send_keys(target: str, keys: str) -> bool:
+def send_keys(target: str, *keys: str) -> bool:
     """Send keys to a tmux pane.
 
     Args:
         target: The tmux target (pane ID like "%1" or window ID like "@1").
-        keys: The keys to send (e.g., "C-d" for Ctrl-D).
+        keys: The keys to send (e.g., "C-d" for Ctrl-D), all in one tmux call.
 
     Returns:
         True if the command succeeded, False otherwise.
     """
     try:
         result = subprocess.run(
-            ["tmux", "send-keys", "-t", target, keys],
+            ["tmux", "send-keys", "-t", target, *keys],
             capture_output=True,
             text=True,
         )
@@ -175,6 +178,71 @@ def send_keys(target: str, keys: str) -> bool:
         return False
 
 
+def get_pane_digest(target: str) -> str | None:
+    """Get a cheap fingerprint of a tmux pane's output state.
+
+    The fingerprint changes whenever the pane scrolls, the cursor moves, the
+    alternate screen toggles, or the window sees output, so an unchanged
+    digest means there is no need to capture the full pane contents.
+
+    Args:
+        target: The tmux target (pane ID like "%1" or window ID like "@1").
+
+    Returns:
+        The digest string, or None on failure.
+    """
+    try:
+        result = subprocess.run(
+            ["tmux", "display-message", "-p", "-t", target, PANE_DIGEST_FORMAT],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip()
+    except FileNotFoundError:
+        return None
+
+
+def get_pane_status(target: str) -> tuple[str, bytes] | None:
+    """Get a pane's digest and its full contents in a single tmux invocation.
+
+    Chains display-message and capture-pane with tmux's ";" command separator
+    so both come back from one subprocess. Contents are left undecoded for
+    callers that only compare them.
+
+    Args:
+        target: The tmux target (pane ID like "%1" or window ID like "@1").
+
+    Returns:
+        (digest, contents) tuple, with contents as raw bytes, or None on failure.
+    """
+    try:
+        result = subprocess.run(
+            [
+                "tmux",
+                "display-message",
+                "-p",
+                "-t",
+                target,
+                PANE_DIGEST_FORMAT,
+                ";",
+                "capture-pane",
+                "-e",
+                "-p",
+                "-t",
+                target,
+            ],
+            capture_output=True,
+        )
+        if result.returncode != 0:
+            return None
+        digest, _, contents = result.stdout.partition(b"\n")
+        return digest.decode(), contents
+    except FileNotFoundError:
+        return None
+
+
 def capture_pane(target: str) -> str | None:
     """Capture the contents of a tmux pane with ANSI escape sequences.
 
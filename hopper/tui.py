@@ -34,6 +34,7 @@ from hopper.backlog import BacklogItem
 from hopper.claude import spawn_claude, switch_to_pane
 from hopper.git import get_diff_stat
 from hopper.lodes import (
+    current_time_ms,
     format_age,
     format_uptime,
     get_lode_dir,
@@ -73,6 +74,11 @@ STATUS_DISCONNECTED = "⊘"  # circled division slash — runner not connected
 HINT_LODE = "_hint_lode"
 HINT_BACKLOG = "_hint_backlog"
 
+# Hint row text, built once (lode table hint depends on active/archive view)
+HINT_LODE_ACTIVE = Text("c to create new lode", style="bright_black italic")
+HINT_LODE_ARCHIVED = Text("← back to active lodes", style="bright_black italic")
+HINT_BACKLOG_TEXT = Text("b to add to backlog", style="bright_black italic")
+
 AUTO_ON = "↻"
 AUTO_OFF = "·"
 
@@ -88,8 +94,11 @@ STATUS_COLORS = {
 
 STAGE_ORDER = {"mill": 0, "refine": 1, "ship": 2, "shipped": 3}
 
+# Rebuild tables at least this often (ms) even without server changes, so ages tick
+AGE_REFRESH_MS = 10_000
+
 
-@dataclass
+@dataclass(slots=True)
 class Row:
     """A row in a table."""
 
@@ -105,8 +114,10 @@ class Row:
     status_text: str = ""  # Human-readable status text
 
 
-def lode_to_row(lode: dict) -> Row:
-    """Convert a lode dict to a display row."""
+def lode_to_row(lode: dict, now: int | None = None) -> Row:
+    """Convert a lode dict to a display row, with ages relative to now (ms)."""
+    if now is None:
+        now = current_time_ms()
     state = lode.get("state", "new")
     if lode.get("stage") == "shipped":
         status = STATUS_SHIPPED
@@ -126,8 +137,8 @@ def lode_to_row(lode: dict) -> Row:
     return Row(
         id=lode["id"],
         stage=stage,
-        age=format_age(lode["created_at"]),
-        last=format_age(lode.get("updated_at", lode["created_at"])),
+        age=format_age(lode["created_at"], now),
+        last=format_age(lode.get("updated_at", lode["created_at"]), now),
         status=status,
         auto=lode.get("auto", False),
         project=lode.get("project", ""),
@@ -1060,6 +1071,11 @@ class HopperApp(App):
         super().__init__()
         self.server = server
         self._lodes: list[dict] = server.lodes if server else []
+        self._lode_index: dict[str, dict] = {}  # id -> lode, see _index_lodes
+        self._lode_index_version: int | None = None  # server state_version it reflects
+        self._refresh_stamp: tuple[int, int] | None = None  # see check_server_updates
+        self._shown_rows: dict[str, Row] = {}  # lode table contents, as last written
+        self._shown_hint: Text | None = None  # lode table hint, as last written
         self._archived_lodes = server.archived_lodes if server else []
         self._archive_view: bool = False
         self._backlog: list[BacklogItem] = server.backlog if server else []
@@ -1093,12 +1109,23 @@ class HopperApp(App):
         self.query_one("#lode-table", LodeTable).focus()
 
     def check_server_updates(self) -> None:
-        """Poll server's lode list and refresh if needed."""
+        """Poll server's lode list and refresh if needed.
+
+        Tables are only rebuilt when the server has processed a mutation since
+        the last poll, or when AGE_REFRESH_MS has passed so age columns tick.
+        """
         self._update_sub_title()
-        self.refresh_table()
-        self.refresh_backlog()
         if self.server:
             self._projects = list(self.server.projects)
+        stamp = (
+            self.server.state_version if self.server else 0,
+            current_time_ms() // AGE_REFRESH_MS,
+        )
+        if stamp == self._refresh_stamp:
+            return
+        self._refresh_stamp = stamp
+        self.refresh_table()
+        self.refresh_backlog()
 
     def _update_sub_title(self) -> None:
         """Update sub_title with git hash and uptime."""
@@ -1141,9 +1168,14 @@ class HopperApp(App):
                 self._lodes, key=lambda lode: STAGE_ORDER.get(lode.get("stage", "mill"), 0)
             )
 
-        # Build rows for the current view.
+        self._index_lodes()
+
+        # Build rows for the current view, reading the clock once for all ages.
+        now = current_time_ms()
         rows = [
-            lode_to_row(s) for s in lodes if self._archive_view or s.get("stage") in STAGE_ORDER
+            lode_to_row(s, now)
+            for s in lodes
+            if self._archive_view or s.get("stage") in STAGE_ORDER
         ]
 
         # Get current row keys in table (excluding hint row)
@@ -1161,9 +1193,13 @@ class HopperApp(App):
         # Remove rows that no longer exist
         for key in existing_keys - desired_keys:
             table.remove_row(key)
+            self._shown_rows.pop(key, None)
 
         # Add or update rows (insert before hint row if it exists)
         for row in rows:
+            if self._shown_rows.get(row.id) == row:
+                continue  # Unchanged; update_cell would only invalidate the table's caches
+            self._shown_rows[row.id] = row
             if row.id in existing_keys:
                 # Update existing row cells
                 table.update_cell(row.id, LodeTable.COL_STATUS, format_status_text(row.status))
@@ -1197,14 +1233,14 @@ class HopperApp(App):
                     key=row.id,
                 )
 
-        hint_text = "← back to active lodes" if self._archive_view else "c to create new lode"
-        hint = Text(hint_text, style="bright_black italic")
+        hint = HINT_LODE_ARCHIVED if self._archive_view else HINT_LODE_ACTIVE
 
         # Keep hint row text in sync with active/archive mode.
-        if has_hint:
-            table.update_cell(HINT_LODE, LodeTable.COL_STATUS_TEXT, hint)
-        else:
+        if not has_hint:
             table.add_row("", "", "", "", "", "", "", "", hint, key=HINT_LODE)
+        elif hint is not self._shown_hint:
+            table.update_cell(HINT_LODE, LodeTable.COL_STATUS_TEXT, hint)
+        self._shown_hint = hint
 
     def refresh_backlog(self) -> None:
         """Refresh the backlog table using incremental updates."""
@@ -1225,8 +1261,9 @@ class HopperApp(App):
         for key in existing_keys - desired_keys:
             table.remove_row(key)
 
+        now = current_time_ms()
         for item in items:
-            age = format_age(item.created_at)
+            age = format_age(item.created_at, now)
             if item.id in existing_keys:
                 table.update_cell(item.id, BacklogTable.COL_PROJECT, item.project)
                 table.update_cell(item.id, BacklogTable.COL_DESCRIPTION, item.description)
@@ -1240,8 +1277,7 @@ class HopperApp(App):
 
         # Add hint row at the bottom if not already there
         if not has_hint:
-            hint = Text("b to add to backlog", style="bright_black italic")
-            table.add_row("", "", hint, key=HINT_BACKLOG)
+            table.add_row("", "", HINT_BACKLOG_TEXT, key=HINT_BACKLOG)
 
     def _get_selected_row_key(self, table: DataTable) -> str | None:
         """Get the row key of the selected row in a table."""
@@ -1271,12 +1307,17 @@ class HopperApp(App):
                 return item
         return None
 
+    def _index_lodes(self) -> None:
+        """Rebuild the id -> lode index from the server's current lode list."""
+        self._lode_index = {lode["id"]: lode for lode in self._lodes}
+        self._lode_index_version = self.server.state_version if self.server else 0
+
     def _get_lode(self, lode_id: str) -> dict | None:
-        """Get a lode by ID."""
-        for lode in self._lodes:
-            if lode["id"] == lode_id:
-                return lode
-        return None
+        """Get an active lode by ID, reindexing if the server changed state since."""
+        version = self.server.state_version if self.server else 0
+        if version != self._lode_index_version:
+            self._index_lodes()
+        return self._lode_index.get(lode_id)
 
     def _require_projects(self) -> bool:
         """Check that projects are configured. Returns True if available."""
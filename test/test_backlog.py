@@ -3,7 +3,11 @@
 
 """Tests for backlog management."""
 
+import json
+from unittest.mock import patch
+
 from hopper.backlog import (
+    COMPACT_MIN_TOMBSTONES,
     BacklogItem,
     add_backlog_item,
     find_by_prefix,
@@ -100,6 +104,21 @@ def test_add_backlog_item(temp_config):
     assert loaded[0].id == item.id
 
 
+def test_add_backlog_item_appends(temp_config):
+    """add_backlog_item appends one line without rewriting existing ones."""
+    backlog_file = temp_config / "backlog.jsonl"
+    save_backlog([BacklogItem(id="id-1", project="p", description="d", created_at=1000)])
+    first_line = backlog_file.read_text()
+
+    items = load_backlog()
+    add_backlog_item(items, "proj", "Second")
+
+    text = backlog_file.read_text()
+    assert text.startswith(first_line)
+    assert len(text.splitlines()) == 2
+    assert [item.id for item in load_backlog()] == [item.id for item in items]
+
+
 def test_add_backlog_item_with_session(temp_config):
     """add_backlog_item records the session that added it."""
     items: list[BacklogItem] = []
@@ -121,6 +140,71 @@ def test_remove_backlog_item(temp_config):
     assert len(loaded) == 0
 
 
+def test_remove_backlog_item_appends_tombstone(temp_config):
+    """remove_backlog_item appends a tombstone that load_backlog applies."""
+    items: list[BacklogItem] = []
+    keep = add_backlog_item(items, "proj", "Keep")
+    gone = add_backlog_item(items, "proj", "Remove")
+
+    remove_backlog_item(items, gone.id)
+
+    lines = (temp_config / "backlog.jsonl").read_text().splitlines()
+    assert len(lines) == 3
+    assert json.loads(lines[-1]) == {"removed": gone.id}
+    assert [item.id for item in load_backlog()] == [keep.id]
+
+
+def test_remove_backlog_item_compacts(temp_config):
+    """Enough tombstones trigger a compacting rewrite of the backlog file."""
+    items: list[BacklogItem] = []
+    for i in range(COMPACT_MIN_TOMBSTONES + 1):
+        add_backlog_item(items, "proj", f"Item {i}")
+    load_backlog()  # Reset tombstone count
+
+    for item in list(items[:COMPACT_MIN_TOMBSTONES]):
+        remove_backlog_item(items, item.id)
+
+    lines = (temp_config / "backlog.jsonl").read_text().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["id"] == items[0].id
+
+
+def test_load_backlog_drops_torn_append(temp_config):
+    """An unterminated last line from an interrupted append is discarded."""
+    items = []
+    item = add_backlog_item(items, "proj", "Keep me")
+    backlog_file = temp_config / "backlog.jsonl"
+    with open(backlog_file, "a") as f:
+        f.write('{"id": "torn", "proj')
+
+    loaded = load_backlog()
+    assert [i.id for i in loaded] == [item.id]
+    # The next write rewrites, so its record doesn't land on the torn line
+    add_backlog_item(loaded, "proj", "Next")
+    assert backlog_file.read_text().endswith("\n")
+    assert len(load_backlog()) == 2
+
+
+def test_load_backlog_leaves_torn_file_untouched(temp_config):
+    """Loading never writes, even when the file ends in a torn line."""
+    add_backlog_item([], "proj", "Keep me")
+    backlog_file = temp_config / "backlog.jsonl"
+    with open(backlog_file, "a") as f:
+        f.write('{"id": "torn", "proj')
+    before = backlog_file.read_bytes()
+
+    load_backlog()
+    assert backlog_file.read_bytes() == before
+
+
+def test_append_record_fsyncs(temp_config):
+    """Appended records are fsynced before the mutation returns."""
+    items = load_backlog()
+    with patch("hopper.fsutil.os.fsync") as mock_fsync:
+        add_backlog_item(items, "proj", "Durable")
+    mock_fsync.assert_called_once()
+
+
 def test_remove_backlog_item_not_found(temp_config):
     """remove_backlog_item returns None for unknown ID."""
     items: list[BacklogItem] = []
@@ -181,3 +265,13 @@ def test_find_by_prefix_ambiguous():
         BacklogItem(id="aaaa1122", project="p", description="d", created_at=2000),
     ]
     assert find_by_prefix(items, "aaaa11") is None
+
+
+def test_find_by_prefix_full_id():
+    """find_by_prefix matches a full-length ID exactly."""
+    items = [
+        BacklogItem(id="aaaa1111", project="p", description="d", created_at=1000),
+        BacklogItem(id="aaaa1112", project="p", description="d", created_at=2000),
+    ]
+    assert find_by_prefix(items, "aaaa1112") is items[1]
+    assert find_by_prefix(items, "aaaa1113") is None
@@ -34,11 +34,7 @@ def server(socket_path):
     thread = threading.Thread(target=srv.start, daemon=True)
     thread.start()
 
-    for _ in range(50):
-        if socket_path.exists():
-            break
-        time.sleep(0.1)
-    else:
+    if not srv.ready.wait(timeout=5):
         raise TimeoutError("Server did not start")
 
     yield srv
@@ -55,11 +51,7 @@ def server_with_tmux(socket_path):
     thread = threading.Thread(target=srv.start, daemon=True)
     thread.start()
 
-    for _ in range(50):
-        if socket_path.exists():
-            break
-        time.sleep(0.1)
-    else:
+    if not srv.ready.wait(timeout=5):
         raise TimeoutError("Server did not start")
 
     yield srv
@@ -128,6 +120,16 @@ def test_send_message_no_response(server, socket_path):
     assert result is None
 
 
+def test_send_message_large_response(server, socket_path):
+    """Responses spanning several recv chunks are reassembled."""
+    server.lodes = [{"id": f"lode{i:04d}", "status": "x" * 100} for i in range(100)]
+
+    result = send_message(socket_path, {"type": "lode_list"}, wait_for_response=True)
+    assert result is not None
+    assert len(result["lodes"]) == 100
+    assert result["lodes"][-1]["id"] == "lode0099"
+
+
 def test_send_message_connection_failure():
     """Send message fails gracefully when no server."""
     result = send_message(
@@ -323,10 +325,7 @@ class TestHopperConnection:
         thread1 = threading.Thread(target=srv1.start, daemon=True)
         thread1.start()
 
-        for _ in range(50):
-            if socket_path.exists():
-                break
-            time.sleep(0.1)
+        srv1.ready.wait(timeout=5)
 
         conn = HopperConnection(socket_path)
         conn.start()
@@ -343,10 +342,7 @@ class TestHopperConnection:
         thread2 = threading.Thread(target=srv2.start, daemon=True)
         thread2.start()
 
-        for _ in range(50):
-            if socket_path.exists():
-                break
-            time.sleep(0.1)
+        srv2.ready.wait(timeout=5)
 
         # Give time to reconnect (reconnect rate is 1/sec)
         time.sleep(1.5)
@@ -381,10 +377,7 @@ class TestHopperConnection:
         thread1 = threading.Thread(target=srv1.start, daemon=True)
         thread1.start()
 
-        for _ in range(50):
-            if socket_path.exists():
-                break
-            time.sleep(0.1)
+        srv1.ready.wait(timeout=5)
 
         conn = HopperConnection(socket_path)
         conn.start(on_connect=lambda: calls.append(1))
@@ -403,10 +396,7 @@ class TestHopperConnection:
         thread2 = threading.Thread(target=srv2.start, daemon=True)
         thread2.start()
 
-        for _ in range(50):
-            if socket_path.exists():
-                break
-            time.sleep(0.1)
+        srv2.ready.wait(timeout=5)
 
         # Give time to reconnect (reconnect rate is 1/sec)
         time.sleep(1.5)
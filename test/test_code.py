@@ -150,7 +150,7 @@ class TestRunCode:
 
         output = capsys.readouterr().out
         assert "Audit Result" in output
-        assert "All good" in output
+        assert output.endswith("# Audit Result\nAll good.\n")
 
         # Input prompt saved
         assert (session_dir / "audit.in.md").read_text() == "prompt text"
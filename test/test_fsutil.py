@@ -0,0 +1,63 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# Copyright (c) 2026 sol pbc
+
+"""Tests for durable file writes."""
+
+import os
+from unittest.mock import patch
+
+from hopper.fsutil import append_synced, atomic_write, fsync_dir, write_all
+
+
+def test_write_all_loops_on_short_writes(tmp_path):
+    """Short writes are retried until every byte is written."""
+    real_write = os.write
+    path = tmp_path / "out"
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT)
+    try:
+        # Kernel accepts at most 3 bytes per call
+        with patch("hopper.fsutil.os.write", side_effect=lambda f, b: real_write(f, b[:3])) as w:
+            write_all(fd, b"hello world")
+    finally:
+        os.close(fd)
+    assert path.read_bytes() == b"hello world"
+    assert w.call_count == 4
+
+
+def test_atomic_write_replaces_file(tmp_path):
+    """atomic_write replaces the target and leaves no temp file behind."""
+    path = tmp_path / "data.json"
+    path.write_text("old")
+    with patch("hopper.fsutil.os.fsync") as mock_fsync:
+        atomic_write(path, b"new")
+    assert path.read_bytes() == b"new"
+    assert not (tmp_path / "data.json.tmp").exists()
+    mock_fsync.assert_called_once()
+
+
+def test_append_synced_appends(tmp_path):
+    """append_synced creates the file and appends to it, fsyncing each time."""
+    path = tmp_path / "log.jsonl"
+    with patch("hopper.fsutil.os.fsync") as mock_fsync:
+        append_synced(path, b"a\n")
+        append_synced(path, b"b\n")
+    assert path.read_bytes() == b"a\nb\n"
+    assert mock_fsync.call_count == 2
+
+
+def test_fsync_dir_flushes_directory(tmp_path):
+    """fsync_dir fsyncs the directory itself."""
+    with patch("hopper.fsutil.os.fsync") as mock_fsync:
+        fsync_dir(tmp_path)
+    mock_fsync.assert_called_once()
+
+
+def test_fsync_dir_ignores_unsupported_filesystem(tmp_path):
+    """A filesystem that rejects directory fsync doesn't fail the caller."""
+    with patch("hopper.fsutil.os.fsync", side_effect=OSError("EINVAL")):
+        fsync_dir(tmp_path)
+
+
+def test_fsync_dir_ignores_missing_directory(tmp_path):
+    """A directory that can't be opened is skipped."""
+    fsync_dir(tmp_path / "missing")
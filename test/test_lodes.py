@@ -4,20 +4,28 @@
 """Tests for lode management."""
 
 import json
+import os
 import uuid
+from unittest.mock import patch
 
+from hopper import lodes as lodes_module
 from hopper.lodes import (
+    COMPACT_MIN_STALE,
     ID_ALPHABET,
     ID_LEN,
+    _archived_ids,
     archive_lode,
     create_lode,
     current_time_ms,
+    deferred_save,
     format_age,
     format_duration_ms,
     format_uptime,
     get_lode_dir,
+    load_archived_lodes,
     load_lodes,
     reset_lode_claude_stage,
+    save_lode,
     save_lodes,
     set_lode_claude_started,
     touch,
@@ -245,6 +253,29 @@ def test_archive_appends(temp_config):
     assert len(lines) == 2
 
 
+def test_archived_ids_cached_until_archive_changes(temp_config):
+    """Archived IDs are parsed once and re-read only after the file changes."""
+    lodes_list = [
+        {"id": "id111111", "stage": "mill", "created_at": 1000, "updated_at": 1000, "state": "new"},
+        {"id": "id222222", "stage": "mill", "created_at": 2000, "updated_at": 2000, "state": "new"},
+    ]
+    save_lodes(lodes_list)
+    archive_lode(lodes_list, "id111111")
+
+    with patch("hopper.lodes.json.loads", wraps=json.loads) as mock_loads:
+        assert _archived_ids() == {"id111111"}
+        assert _archived_ids() == {"id111111"}
+        assert mock_loads.call_count == 1
+
+        archive_lode(lodes_list, "id222222")
+        assert _archived_ids() == {"id111111", "id222222"}
+
+
+def test_archived_ids_missing_file(temp_config):
+    """No archive file means no archived IDs."""
+    assert _archived_ids() == frozenset()
+
+
 def test_atomic_save(temp_config):
     """Test that save is atomic (no temp file left behind)."""
     lodes_list = [
@@ -261,6 +292,159 @@ def test_atomic_save(temp_config):
     assert main_file.exists()
 
 
+def test_load_lodes_non_ascii(temp_config):
+    """Records are parsed from raw UTF-8 bytes, including a torn multibyte tail."""
+    lodes = []
+    lode = create_lode(lodes, "proj", scope="café ☕")
+    with open(temp_config / "active.jsonl", "ab") as f:
+        f.write('{"id": "torn", "scope": "☕'.encode()[:-1])
+
+    loaded = load_lodes()
+    assert loaded == [lode]
+    assert load_archived_lodes() == []
+
+
+def test_save_lodes_single_write(temp_config):
+    """The whole file goes out in one write and is fsynced before the rename."""
+    lodes = [{"id": f"testid{i:02d}", "stage": "mill"} for i in range(5)]
+    with patch("hopper.fsutil.os.write", wraps=os.write) as mock_write:
+        with patch("hopper.fsutil.os.fsync") as mock_fsync:
+            save_lodes(lodes)
+
+    assert mock_write.call_count == 1
+    mock_fsync.assert_called()
+    assert load_lodes() == lodes
+
+
+def test_save_lodes_fsyncs_directory(temp_config):
+    """The rename is made durable by fsyncing the containing directory."""
+    with patch("hopper.lodes.fsync_dir") as mock_fsync_dir:
+        save_lodes([{"id": "testid11", "stage": "mill"}])
+    mock_fsync_dir.assert_called_once_with(temp_config)
+
+
+def test_archive_lode_fsyncs_append(temp_config):
+    """The archive append is one fsynced write before the active file is rewritten."""
+    lodes = []
+    lode = create_lode(lodes, "proj")
+    create_lode(lodes, "proj")
+    with (
+        patch("hopper.fsutil.os.fsync") as mock_fsync,
+        patch("hopper.fsutil.os.write", wraps=os.write) as mock_write,
+    ):
+        archive_lode(lodes, lode["id"])
+    # Archive append, temp file, and directory
+    assert mock_fsync.call_count == 3
+    # Archive append, then the active.jsonl rewrite
+    assert mock_write.call_count == 2
+    assert mock_write.call_args_list[0].args[1] == (json.dumps(lode) + "\n").encode()
+
+
+def test_archive_lode_survives_short_writes(temp_config):
+    """A short write to archived.jsonl is retried rather than truncating the record."""
+    real_write = os.write
+    lodes = []
+    lode = create_lode(lodes, "proj")
+    with patch("hopper.fsutil.os.write", side_effect=lambda fd, b: real_write(fd, b[:16])):
+        archive_lode(lodes, lode["id"])
+    assert load_archived_lodes() == [lode]
+
+
+def test_deferred_save_rewrites_once(temp_config):
+    """Full rewrites inside deferred_save collapse into one on exit."""
+    lodes = []
+    for _ in range(3):
+        create_lode(lodes, "proj")
+    with patch("hopper.fsutil.os.replace", wraps=os.replace) as mock_replace:
+        with deferred_save(lodes):
+            archive_lode(lodes, lodes[0]["id"])
+            archive_lode(lodes, lodes[0]["id"])
+            assert mock_replace.call_count == 0
+            assert len(load_archived_lodes()) == 2
+    mock_replace.assert_called_once()
+    assert load_lodes() == lodes
+
+
+def test_deferred_save_without_changes_skips_write(temp_config):
+    """No save is made if nothing inside the block asked for one."""
+    with patch("hopper.fsutil.os.replace") as mock_replace:
+        with deferred_save([]):
+            pass
+    mock_replace.assert_not_called()
+
+
+def test_create_lode_appends(temp_config):
+    """Creating a lode appends one fsynced record instead of rewriting the file."""
+    lodes = []
+    first = create_lode(lodes, "proj")
+    with (
+        patch("hopper.lodes.save_lodes") as mock_save,
+        patch("hopper.fsutil.os.fsync") as mock_fsync,
+    ):
+        second = create_lode(lodes, "proj")
+    mock_save.assert_not_called()
+    mock_fsync.assert_called_once()
+
+    lines = (temp_config / "active.jsonl").read_text().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [first["id"], second["id"]]
+
+
+def test_update_appends_and_load_keeps_last(temp_config):
+    """Updates append full records; loading keeps the latest per lode, in order."""
+    lodes = []
+    first = create_lode(lodes, "proj")
+    second = create_lode(lodes, "proj")
+    update_lode_stage(lodes, first["id"], "refine")
+    update_lode_title(lodes, first["id"], "Renamed")
+
+    assert len((temp_config / "active.jsonl").read_text().splitlines()) == 4
+    loaded = load_lodes()
+    assert [lode["id"] for lode in loaded] == [first["id"], second["id"]]
+    assert loaded[0]["stage"] == "refine"
+    assert loaded[0]["title"] == "Renamed"
+
+
+def test_save_lode_compacts(temp_config):
+    """Superseded records are compacted away once enough accrue."""
+    lodes = []
+    lode = create_lode(lodes, "proj")
+    load_lodes()
+    for _ in range(COMPACT_MIN_STALE - 1):
+        save_lode(lodes, lode)
+    assert len((temp_config / "active.jsonl").read_text().splitlines()) == COMPACT_MIN_STALE
+
+    save_lode(lodes, lode)
+    assert len((temp_config / "active.jsonl").read_text().splitlines()) == 1
+    assert lodes_module._stale_records == 0
+
+
+def test_load_lodes_counts_stale_records(temp_config):
+    """Loading counts superseded records toward the next compaction."""
+    lodes = []
+    lode = create_lode(lodes, "proj")
+    save_lode(lodes, lode)
+    save_lode(lodes, lode)
+
+    load_lodes()
+    assert lodes_module._stale_records == 2
+
+
+def test_load_lodes_drops_torn_append(temp_config):
+    """An unterminated last line from an interrupted append is discarded."""
+    lodes = []
+    lode = create_lode(lodes, "proj")
+    lodes_file = temp_config / "active.jsonl"
+    with open(lodes_file, "a") as f:
+        f.write('{"id": "torn')
+
+    loaded = load_lodes()
+    assert [lode["id"] for lode in loaded] == [lode["id"]]
+    # File is rewritten so the next append starts on its own line
+    assert lodes_file.read_text().endswith("\n")
+    create_lode(loaded, "proj")
+    assert len(load_lodes()) == 2
+
+
 def test_get_lode_dir(temp_config):
     """Test lode directory path."""
     path = get_lode_dir("my-lode-id")
@@ -314,6 +498,13 @@ def test_format_age_future():
     assert format_age(now + 60_000) == "now"  # 1 minute in future
 
 
+def test_format_age_explicit_now():
+    """An explicit now is used instead of reading the clock."""
+    with patch("hopper.lodes.current_time_ms") as mock_now:
+        assert format_age(1_000, now=1_000 + 3 * 3_600_000) == "3h"
+    mock_now.assert_not_called()
+
+
 # Tests for format_uptime
 
 
@@ -3,10 +3,15 @@
 
 """Tests for the base runner module."""
 
+import hashlib
+import io
+import threading
+from collections import deque
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from hopper.runner import BaseRunner, extract_error_message
+from hopper.lodes import current_time_ms
+from hopper.runner import BaseRunner, drain_stderr, extract_error_message
 
 
 class TestExtractErrorMessage:
@@ -30,6 +35,22 @@ class TestExtractErrorMessage:
         result = extract_error_message(stderr)
         assert result == "line3\nline4\nline5\nline6\nline7"
 
+    def test_keeps_blank_and_indented_lines_in_tail(self):
+        """Blank and indented lines inside the tail are kept as-is."""
+        stderr = b"line1\nline2\n  indented\n\nline5\nline6\n\n"
+        result = extract_error_message(stderr)
+        assert result == "line2\n  indented\n\nline5\nline6"
+
+    def test_splits_on_unicode_line_breaks(self):
+        """Line breaks beyond \\n are counted as str.splitlines counts them."""
+        stderr = "a\nb\x1cc\x85d\u2028e\nf\n".encode()
+        result = extract_error_message(stderr)
+        assert result == "b\nc\nd\ne\nf"
+
+    def test_whitespace_only_returns_none(self):
+        """Whitespace-only stderr returns None."""
+        assert extract_error_message(b"  \n\n \n") is None
+
     def test_preserves_newlines(self):
         """Newlines are preserved in output."""
         stderr = b"error on\nmultiple lines\n"
@@ -50,6 +71,23 @@ class TestExtractErrorMessage:
         assert "invalid" in result
 
 
+class TestDrainStderr:
+    def test_keeps_bounded_tail(self):
+        """Draining keeps only the most recent lines."""
+        stream = io.BytesIO(b"".join(f"line{i}\n".encode() for i in range(10)))
+        tail: deque[bytes] = deque(maxlen=3)
+        drain_stderr(stream, tail)
+        assert list(tail) == [b"line7\n", b"line8\n", b"line9\n"]
+
+    def test_closed_stream_is_ignored(self):
+        """A pipe closed underneath the reader ends the drain quietly."""
+        stream = io.BytesIO(b"data\n")
+        stream.close()
+        tail: deque[bytes] = deque(maxlen=3)
+        drain_stderr(stream, tail)
+        assert list(tail) == []
+
+
 class TestBaseRunnerActivityMonitor:
     """Tests for BaseRunner activity monitor shared behavior."""
 
@@ -57,6 +95,9 @@ class TestBaseRunnerActivityMonitor:
         runner = BaseRunner("test-session", Path("/tmp/test.sock"))
         return runner
 
+    def _hash(self, contents: bytes) -> bytes:
+        return hashlib.blake2b(contents, digest_size=8).digest()
+
     def test_check_activity_detects_stuck(self):
         """Monitor detects stuck state when pane content doesn't change."""
         runner = self._make_runner()
@@ -67,9 +108,9 @@ class TestBaseRunnerActivityMonitor:
         mock_conn.emit = lambda msg_type, **kw: emitted.append((msg_type, kw)) or True
         runner.connection = mock_conn
 
-        runner._last_snapshot = "Hello World"
+        runner._last_hash = self._hash(b"Hello World")
 
-        with patch("hopper.runner.capture_pane", return_value="Hello World"):
+        with patch("hopper.runner.get_pane_status", return_value=("10|0|5|0|1000", b"Hello World")):
             runner._check_activity()
 
         assert runner._stuck_since is not None
@@ -89,14 +130,16 @@ class TestBaseRunnerActivityMonitor:
         mock_conn.emit = lambda msg_type, **kw: emitted.append((msg_type, kw)) or True
         runner.connection = mock_conn
 
-        runner._last_snapshot = "Hello World"
+        runner._last_hash = self._hash(b"Hello World")
 
-        with patch("hopper.runner.capture_pane", return_value="Hello World 2"):
+        with patch(
+            "hopper.runner.get_pane_status", return_value=("10|0|5|0|1000", b"Hello World 2")
+        ):
             runner._check_activity()
 
         assert runner._stuck_since is None
         assert not any(e[0] == "lode_set_state" and e[1]["state"] == "stuck" for e in emitted)
-        assert runner._last_snapshot == "Hello World 2"
+        assert runner._last_hash == self._hash(b"Hello World 2")
 
     def test_check_activity_recovers_from_stuck(self):
         """Monitor emits running when recovering from stuck state."""
@@ -108,10 +151,13 @@ class TestBaseRunnerActivityMonitor:
         mock_conn.emit = lambda msg_type, **kw: emitted.append((msg_type, kw)) or True
         runner.connection = mock_conn
 
-        runner._last_snapshot = "Hello World"
+        runner._last_hash = self._hash(b"Hello World")
         runner._stuck_since = 1000
 
-        with patch("hopper.runner.capture_pane", return_value="New content"):
+        with (
+            patch("hopper.runner.get_pane_digest", return_value="10|0|5|0|1000"),
+            patch("hopper.runner.get_pane_status", return_value=("10|0|5|0|1000", b"New")),
+        ):
             runner._check_activity()
 
         assert runner._stuck_since is None
@@ -128,11 +174,83 @@ class TestBaseRunnerActivityMonitor:
         runner._pane_id = "%1"
         runner._monitor_stop.clear()
 
-        with patch("hopper.runner.capture_pane", return_value=None):
+        with patch("hopper.runner.get_pane_status", return_value=None):
+            runner._check_activity()
+
+        assert runner._monitor_stop.is_set()
+
+    def test_check_activity_active_pane_uses_single_tmux_call(self):
+        """Active monitor fetches digest and contents together."""
+        runner = self._make_runner()
+        runner._pane_id = "%1"
+        runner._last_hash = self._hash(b"Hello World")
+
+        with (
+            patch("hopper.runner.get_pane_status", return_value=("1|0|0|0|1", b"Next")) as status,
+            patch("hopper.runner.get_pane_digest") as mock_digest,
+        ):
+            runner._check_activity()
+
+        status.assert_called_once_with("%1")
+        mock_digest.assert_not_called()
+        assert runner._last_digest == "1|0|0|0|1"
+        assert runner._last_hash == self._hash(b"Next")
+
+    def test_check_activity_skips_capture_when_digest_unchanged(self):
+        """Idle monitor reports stuck without capturing when the pane digest is unchanged."""
+        runner = self._make_runner()
+        runner._pane_id = "%1"
+        runner._last_digest = "10|0|5|0|1000"
+        runner._last_hash = self._hash(b"Hello World")
+        runner._stuck_since = current_time_ms() - 5000
+
+        emitted = []
+        mock_conn = MagicMock()
+        mock_conn.emit = lambda msg_type, **kw: emitted.append((msg_type, kw)) or True
+        runner.connection = mock_conn
+
+        with (
+            patch("hopper.runner.get_pane_digest", return_value="10|0|5|0|1000"),
+            patch("hopper.runner.get_pane_status") as mock_capture,
+        ):
+            runner._check_activity()
+
+        mock_capture.assert_not_called()
+        assert runner._stuck_since is not None
+        assert any(e[0] == "lode_set_state" and e[1]["state"] == "stuck" for e in emitted)
+
+    def test_check_activity_stops_on_digest_failure(self):
+        """Idle monitor stops when the pane digest query fails."""
+        runner = self._make_runner()
+        runner._pane_id = "%1"
+        runner._stuck_since = 1000
+        runner._monitor_stop.clear()
+
+        with (
+            patch("hopper.runner.get_pane_digest", return_value=None),
+            patch("hopper.runner.get_pane_status") as mock_capture,
+        ):
             runner._check_activity()
 
+        mock_capture.assert_not_called()
         assert runner._monitor_stop.is_set()
 
+    def test_monitor_loop_backs_off_while_stuck(self):
+        """Monitor interval doubles while stuck and resets on activity."""
+        runner = self._make_runner()
+        stuck = iter([1000, 1000, 1000, 1000, None, None])
+        waits = []
+        runner._monitor_stop = MagicMock()
+        runner._monitor_stop.wait = lambda t: waits.append(t) or len(waits) > 6
+
+        def check():
+            runner._stuck_since = next(stuck)
+
+        with patch.object(runner, "_check_activity", side_effect=check):
+            runner._monitor_loop()
+
+        assert waits == [5.0, 10.0, 10.0, 10.0, 10.0, 5.0, 5.0]
+
     def test_start_monitor_renames_window(self):
         """Monitor renames tmux window to session ID."""
         runner = self._make_runner()
@@ -164,7 +282,7 @@ class TestBaseRunnerActivityMonitor:
         """Monitor skips stuck detection once done event is set."""
         runner = self._make_runner()
         runner._pane_id = "%1"
-        runner._last_snapshot = "Hello World"
+        runner._last_hash = self._hash(b"Hello World")
         runner._done.set()
 
         emitted = []
@@ -172,7 +290,7 @@ class TestBaseRunnerActivityMonitor:
         mock_conn.emit = lambda msg_type, **kw: emitted.append((msg_type, kw)) or True
         runner.connection = mock_conn
 
-        with patch("hopper.runner.capture_pane", return_value="Hello World"):
+        with patch("hopper.runner.get_pane_status", return_value=("10|0|5|0|1000", b"Hello World")):
             runner._check_activity()
 
         assert not any(e[0] == "lode_set_state" and e[1]["state"] == "stuck" for e in emitted)
@@ -234,7 +352,7 @@ class TestBaseRunnerDismiss:
     """Tests for BaseRunner auto-dismiss behavior."""
 
     def test_wait_and_dismiss_sends_ctrl_d(self):
-        """Dismiss thread sends two Ctrl-D after screen stabilizes."""
+        """Dismiss thread sends two Ctrl-D in one call after screen stabilizes."""
         runner = BaseRunner("test-session", Path("/tmp/test.sock"))
         runner._pane_id = "%1"
         runner._done.set()
@@ -246,13 +364,13 @@ class TestBaseRunnerDismiss:
             patch("hopper.runner.capture_pane", side_effect=lambda _: next(snapshots)),
             patch(
                 "hopper.runner.send_keys",
-                side_effect=lambda w, k: send_keys_calls.append((w, k)) or True,
+                side_effect=lambda w, *k: send_keys_calls.append((w, *k)) or True,
             ),
             patch("hopper.runner.MONITOR_INTERVAL", 0.01),
         ):
             runner._wait_and_dismiss_claude()
 
-        assert send_keys_calls == [("%1", "C-d"), ("%1", "C-d")]
+        assert send_keys_calls == [("%1", "C-d", "C-d")]
 
     def test_wait_and_dismiss_aborts_when_monitor_stops(self):
         """Dismiss thread aborts if monitor stop is set."""
@@ -263,12 +381,46 @@ class TestBaseRunnerDismiss:
         send_keys_calls = []
         with patch(
             "hopper.runner.send_keys",
-            side_effect=lambda w, k: send_keys_calls.append((w, k)),
+            side_effect=lambda w, *k: send_keys_calls.append((w, *k)),
         ):
             runner._wait_and_dismiss_claude()
 
         assert send_keys_calls == []
 
+    def test_wait_and_dismiss_wakes_on_monitor_stop(self):
+        """A waiting dismiss thread returns promptly when the monitor is halted."""
+        runner = BaseRunner("test-session", Path("/tmp/test.sock"))
+        runner._pane_id = "%1"
+
+        with patch("hopper.runner.send_keys") as mock_send:
+            thread = threading.Thread(target=runner._wait_and_dismiss_claude)
+            thread.start()
+            runner._halt_monitor()
+            thread.join(timeout=1.0)
+
+        assert not thread.is_alive()
+        mock_send.assert_not_called()
+
+    def test_wait_and_dismiss_wakes_on_completion(self):
+        """A waiting dismiss thread proceeds as soon as completion arrives."""
+        runner = BaseRunner("test-session", Path("/tmp/test.sock"))
+        runner._pane_id = "%1"
+
+        with (
+            patch("hopper.runner.capture_pane", return_value="stable"),
+            patch("hopper.runner.send_keys") as mock_send,
+            patch("hopper.runner.MONITOR_INTERVAL", 0.01),
+        ):
+            thread = threading.Thread(target=runner._wait_and_dismiss_claude)
+            thread.start()
+            runner._on_server_message(
+                {"type": "lode_updated", "lode": {"id": "test-session", "state": "completed"}}
+            )
+            thread.join(timeout=1.0)
+
+        assert not thread.is_alive()
+        mock_send.assert_called_once_with("%1", "C-d", "C-d")
+
     def test_wait_and_dismiss_aborts_without_pane(self):
         """Dismiss thread aborts if no pane ID."""
         runner = BaseRunner("test-session", Path("/tmp/test.sock"))
@@ -278,7 +430,7 @@ class TestBaseRunnerDismiss:
         send_keys_calls = []
         with patch(
             "hopper.runner.send_keys",
-            side_effect=lambda w, k: send_keys_calls.append((w, k)),
+            side_effect=lambda w, *k: send_keys_calls.append((w, *k)),
         ):
             runner._wait_and_dismiss_claude()
 
@@ -13,7 +13,7 @@ import pytest
 
 from hopper.lodes import save_lodes
 from hopper.projects import Project
-from hopper.server import Server, get_git_hash
+from hopper.server import OUTBOX_HIGH_WATER, SERVER_RECV_CHUNK, Server, get_git_hash
 
 
 class TestGetGitHash:
@@ -62,12 +62,7 @@ def server(socket_path):
     thread = threading.Thread(target=srv.start, daemon=True)
     thread.start()
 
-    # Wait for socket to be created
-    for _ in range(50):
-        if socket_path.exists():
-            break
-        time.sleep(0.1)
-    else:
+    if not srv.ready.wait(timeout=5):
         raise TimeoutError("Server did not start")
 
     yield srv
@@ -82,11 +77,7 @@ def test_server_creates_socket(socket_path):
     thread = threading.Thread(target=srv.start, daemon=True)
     thread.start()
 
-    for _ in range(50):
-        if socket_path.exists():
-            break
-        time.sleep(0.1)
-
+    assert srv.ready.wait(timeout=5)
     assert socket_path.exists()
 
     srv.stop()
@@ -106,11 +97,7 @@ def test_server_clears_stale_pid_on_startup(socket_path, temp_config, make_lode)
     thread.start()
 
     try:
-        for _ in range(50):
-            if socket_path.exists():
-                break
-            time.sleep(0.1)
-        else:
+        if not srv.ready.wait(timeout=5):
             raise TimeoutError("Server did not start")
 
         assert srv.lodes[0]["pid"] is None
@@ -129,11 +116,7 @@ def test_startup_archives_shipped_lodes(socket_path, temp_config, make_lode):
     thread.start()
 
     try:
-        for _ in range(50):
-            if socket_path.exists():
-                break
-            time.sleep(0.1)
-        else:
+        if not srv.ready.wait(timeout=5):
             raise TimeoutError("Server did not start")
 
         assert srv.lodes == []
@@ -171,11 +154,7 @@ def test_cleanup_worktree_on_startup_archive(socket_path, temp_config, make_lode
         thread.start()
 
         try:
-            for _ in range(50):
-                if socket_path.exists():
-                    break
-                time.sleep(0.1)
-            else:
+            if not srv.ready.wait(timeout=5):
                 raise TimeoutError("Server did not start")
 
             for _ in range(50):
@@ -207,11 +186,7 @@ def test_cleanup_skipped_without_worktree_dir(socket_path, temp_config, make_lod
         thread.start()
 
         try:
-            for _ in range(50):
-                if socket_path.exists():
-                    break
-                time.sleep(0.1)
-            else:
+            if not srv.ready.wait(timeout=5):
                 raise TimeoutError("Server did not start")
 
             for _ in range(50):
@@ -243,11 +218,7 @@ def test_cleanup_skipped_when_project_not_found(socket_path, temp_config, make_l
         thread.start()
 
         try:
-            for _ in range(50):
-                if socket_path.exists():
-                    break
-                time.sleep(0.1)
-            else:
+            if not srv.ready.wait(timeout=5):
                 raise TimeoutError("Server did not start")
 
             for _ in range(50):
@@ -269,7 +240,7 @@ def test_server_broadcast_requires_type():
     result = srv.broadcast({"data": "test"})
 
     assert result is False
-    assert srv.broadcast_queue.qsize() == 0
+    assert len(srv._pending) == 0
 
 
 def test_server_broadcast_queues_valid_message():
@@ -279,12 +250,239 @@ def test_server_broadcast_queues_valid_message():
     result = srv.broadcast({"type": "test", "data": "hello"})
 
     assert result is True
-    assert srv.broadcast_queue.qsize() == 1
-    msg = srv.broadcast_queue.get_nowait()
+    assert len(srv._pending) == 1
+    msg = next(iter(srv._pending.values()))
     assert msg["type"] == "test"
     assert msg["data"] == "hello"
 
 
+def test_server_broadcast_coalesces_lode_updates():
+    """A pending lode_updated is replaced by a newer one for the same lode."""
+    srv = Server(socket_path="/tmp/unused.sock")
+    lode_a = {"id": "aaaaaaaa", "state": "running"}
+    lode_b = {"id": "bbbbbbbb", "state": "running"}
+
+    srv.broadcast({"type": "lode_updated", "lode": lode_a})
+    srv.broadcast({"type": "lode_updated", "lode": lode_b})
+    srv.broadcast({"type": "backlog_added", "item": {"id": "x"}})
+    srv.broadcast({"type": "lode_updated", "lode": lode_a})
+
+    pending = list(srv._pending.values())
+    assert [(m["type"], m.get("lode", {}).get("id")) for m in pending] == [
+        ("lode_updated", "bbbbbbbb"),
+        ("backlog_added", None),
+        ("lode_updated", "aaaaaaaa"),
+    ]
+
+
+def test_server_broadcast_keeps_other_messages_distinct():
+    """Messages other than lode_updated are never coalesced."""
+    srv = Server(socket_path="/tmp/unused.sock")
+    lode = {"id": "aaaaaaaa"}
+
+    srv.broadcast({"type": "lode_created", "lode": lode})
+    srv.broadcast({"type": "lode_archived", "lode": lode})
+    srv.broadcast({"type": "lode_archived", "lode": lode})
+
+    assert len(srv._pending) == 3
+
+
+def test_server_send_to_clients_shuts_down_dead_clients():
+    """A client whose send fails is shut down for the reactor to drop."""
+    srv = Server(socket_path="/tmp/unused.sock")
+    good = MagicMock()
+    good.sendmsg.side_effect = lambda frames: sum(len(f) for f in frames)
+    dead = MagicMock()
+    dead.sendmsg.side_effect = BrokenPipeError
+    srv.clients = (good, dead)
+
+    srv._send_to_clients({"type": "test"})
+
+    good.sendmsg.assert_called_once()
+    good.shutdown.assert_not_called()
+    dead.shutdown.assert_called_once_with(socket.SHUT_RDWR)
+    dead.close.assert_not_called()
+
+
+def test_server_drops_client_on_disconnect(socket_path, server):
+    """The reactor unregisters and forgets a client that hangs up."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(str(socket_path))
+    for _ in range(50):
+        if len(server.clients) > 0:
+            break
+        time.sleep(0.1)
+    assert len(server.clients) == 1
+
+    client.close()
+    for _ in range(50):
+        if len(server.clients) == 0:
+            break
+        time.sleep(0.1)
+    assert server.clients == ()
+    assert len(server._selector.get_map()) == 2  # Listening socket and wakeup only
+
+
+def test_server_send_to_clients_batches_messages():
+    """Several messages reach a client in one sendmsg; the unsent rest is kept."""
+    srv = Server(socket_path="/tmp/unused.sock")
+    client = MagicMock()
+    client.sendmsg.return_value = 5
+    srv.clients = (client,)
+
+    srv._send_to_clients({"type": "a", "ts": 1}, {"type": "b", "ts": 2})
+
+    frames = client.sendmsg.call_args[0][0]
+    assert [json.loads(frame) for frame in frames] == [
+        {"type": "a", "ts": 1},
+        {"type": "b", "ts": 2},
+    ]
+    assert srv._outbox[client] == b"".join(frames)[5:]
+    client.sendall.assert_not_called()
+
+
+def test_server_outbox_flushes_in_order():
+    """Queued bytes go out ahead of newer frames once the client drains."""
+    srv = Server(socket_path="/tmp/unused.sock")
+    client = MagicMock()
+    client.sendmsg.side_effect = BlockingIOError
+    srv.clients = (client,)
+    srv._send_to_clients({"type": "a", "ts": 1})
+    first = bytes(srv._outbox[client])
+
+    sends = []
+    client.send.side_effect = lambda data: sends.append(bytes(data)) or len(data)
+    srv._send_to_clients({"type": "b", "ts": 2})
+
+    sent = sends[0]
+    assert sent.startswith(first)
+    assert json.loads(sent[len(first) :]) == {"type": "b", "ts": 2}
+    assert client not in srv._outbox
+
+
+def test_server_cuts_off_client_past_high_water():
+    """A client that falls too far behind is shut down and its outbox dropped."""
+    srv = Server(socket_path="/tmp/unused.sock")
+    client = MagicMock()
+    client.sendmsg.side_effect = BlockingIOError
+    client.send.side_effect = BlockingIOError
+    srv.clients = (client,)
+
+    with patch("hopper.server.OUTBOX_HIGH_WATER", 100):
+        srv._send_to_clients({"type": "a", "data": "x" * 40})
+        client.shutdown.assert_not_called()
+        srv._send_to_clients({"type": "b", "data": "x" * 40})
+
+    client.shutdown.assert_called_once_with(socket.SHUT_RDWR)
+    assert client not in srv._outbox
+
+
+def test_server_high_water_ignores_direct_responses():
+    """A large direct response isn't cut off; only broadcast backlog counts."""
+    srv = Server(socket_path="/tmp/unused.sock")
+    client = MagicMock()
+    client.sendmsg.side_effect = BlockingIOError
+    client.send.side_effect = BlockingIOError
+    srv.clients = (client,)
+
+    with patch("hopper.server.OUTBOX_HIGH_WATER", 100):
+        srv._send_response(client, {"type": "archived_list", "data": "x" * 400})
+        srv._send_to_clients({"type": "a", "data": "x" * 40})
+        client.shutdown.assert_not_called()
+        srv._send_to_clients({"type": "b", "data": "x" * 40})
+
+    client.shutdown.assert_called_once_with(socket.SHUT_RDWR)
+
+
+def test_server_delivers_response_larger_than_socket_buffer(socket_path, server):
+    """A response past SO_SNDBUF and OUTBOX_HIGH_WATER reaches a slow reader whole."""
+    server.archived_lodes = [{"id": f"lode{i:04d}", "title": "x" * 40000} for i in range(40)]
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(str(socket_path))
+    client.settimeout(2.0)
+    assert len(json.dumps(server.archived_lodes)) > OUTBOX_HIGH_WATER
+    assert len(json.dumps(server.archived_lodes)) > client.getsockopt(
+        socket.SOL_SOCKET, socket.SO_SNDBUF
+    )
+
+    client.sendall(b'{"type": "archived_list"}\n')
+    time.sleep(0.2)  # Let the server fill the socket buffer before reading
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = client.recv(1 << 16)
+        assert chunk, "server closed the connection mid-response"
+        data += chunk
+
+    assert json.loads(data)["lodes"] == server.archived_lodes
+
+    client.close()
+
+
+def test_server_stalled_client_does_not_poll(socket_path, server):
+    """A client that stops reading leaves the server idle until it is writable."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(str(socket_path))
+    for _ in range(50):
+        if len(server.clients) == 1:
+            break
+        time.sleep(0.1)
+
+    server.broadcast({"type": "test", "blob": "x" * 500000})
+    for _ in range(50):
+        if server._outbox:
+            break
+        time.sleep(0.1)
+    assert server._outbox
+
+    with patch.object(server, "_send_frames", wraps=server._send_frames) as mock_send:
+        time.sleep(0.3)
+    mock_send.assert_not_called()
+
+    client.close()
+
+
+def test_server_slow_client_does_not_block_others(socket_path, server):
+    """Broadcasts keep flowing to a reader while another client never reads."""
+    slow = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    slow.connect(str(socket_path))
+    fast = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    fast.connect(str(socket_path))
+    fast.settimeout(2.0)
+    for _ in range(50):
+        if len(server.clients) == 2:
+            break
+        time.sleep(0.1)
+
+    blob = "x" * 65536
+    start = time.monotonic()
+    received = 0
+    for i in range(20):
+        server.broadcast({"type": "test", "i": i, "blob": blob})
+        while received <= i:
+            received += fast.recv(1 << 20).count(b"\n")
+    assert time.monotonic() - start < 2.0
+
+    slow.close()
+    fast.close()
+
+
+def test_server_writer_drains_queue_in_one_batch():
+    """The writer sends everything queued at wake-up as a single batch."""
+    srv = Server(socket_path="/tmp/unused.sock")
+    srv.broadcast({"type": "a"})
+    srv.broadcast({"type": "b"})
+    batches = []
+
+    def record(*messages):
+        batches.append([m["type"] for m in messages])
+        srv.stop_event.set()
+
+    with patch.object(srv, "_send_to_clients", side_effect=record):
+        srv._writer_loop()
+
+    assert batches == [["a", "b"]]
+
+
 def test_server_sends_shutdown_to_clients(socket_path):
     """Server sends shutdown message to connected clients on stop."""
     srv = Server(socket_path)
@@ -292,10 +490,7 @@ def test_server_sends_shutdown_to_clients(socket_path):
     thread.start()
 
     # Wait for socket
-    for _ in range(50):
-        if socket_path.exists():
-            break
-        time.sleep(0.1)
+    srv.ready.wait(timeout=5)
 
     # Connect a client
     client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
@@ -325,6 +520,36 @@ def test_server_sends_shutdown_to_clients(socket_path):
     thread.join(timeout=2)
 
 
+def test_server_stop_flushes_outbox_before_closing(socket_path, server):
+    """A client with a backed-up outbox still gets everything, ending in shutdown."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(str(socket_path))
+    client.settimeout(2.0)
+    for _ in range(50):
+        if len(server.clients) == 1:
+            break
+        time.sleep(0.1)
+
+    server.broadcast({"type": "test", "blob": "x" * 500000})
+    for _ in range(50):
+        if server._outbox:
+            break
+        time.sleep(0.1)
+    assert server._outbox
+
+    stopper = threading.Thread(target=server.stop)
+    stopper.start()
+    data = b""
+    while chunk := client.recv(1 << 16):
+        data += chunk
+    stopper.join(timeout=2)
+
+    messages = [json.loads(line) for line in data.splitlines()]
+    assert [m["type"] for m in messages] == ["test", "shutdown"]
+
+    client.close()
+
+
 def test_server_handles_connect(socket_path, server):
     """Server handles connect message and returns connected response."""
     # Connect client
@@ -347,6 +572,23 @@ def test_server_handles_connect(socket_path, server):
     client.close()
 
 
+def test_server_handles_ping(socket_path, server):
+    """Server answers ping with a pong carrying a timestamp."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(str(socket_path))
+    client.settimeout(2.0)
+
+    client.sendall(b'{"type": "ping"}\n')
+
+    data = client.recv(4096)
+    response = json.loads(data)
+    assert response["type"] == "pong"
+    assert isinstance(response["ts"], int)
+    assert data == (json.dumps(response) + "\n").encode("utf-8")
+
+    client.close()
+
+
 def test_server_handles_connect_with_tmux_location(socket_path, temp_config):
     """Server includes tmux location in connect response."""
     tmux_location = {"lode": "main", "pane": "%0"}
@@ -354,11 +596,7 @@ def test_server_handles_connect_with_tmux_location(socket_path, temp_config):
     thread = threading.Thread(target=srv.start, daemon=True)
     thread.start()
 
-    for _ in range(50):
-        if socket_path.exists():
-            break
-        time.sleep(0.1)
-    else:
+    if not srv.ready.wait(timeout=5):
         raise TimeoutError("Server did not start")
 
     try:
@@ -468,6 +706,99 @@ def test_server_handles_lode_set_state(socket_path, server, temp_config, make_lo
     client.close()
 
 
+def test_server_bumps_state_version_per_event(server):
+    """Each processed mutation bumps state_version, broadcast or not."""
+    before = server.state_version
+    server.enqueue({"type": "backlog_update", "item_id": "missing", "description": "x"})
+
+    for _ in range(50):
+        if server.state_version > before:
+            break
+        time.sleep(0.1)
+    assert server.state_version == before + 1
+
+
+def test_server_handles_multibyte_split_across_reads(socket_path, server, temp_config, make_lode):
+    """A UTF-8 character split between two reads is framed intact."""
+    lode = make_lode(id="test-id")
+    server.lodes = [lode]
+    save_lodes(server.lodes)
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(str(socket_path))
+    client.settimeout(2.0)
+
+    msg = {"type": "lode_set_title", "lode_id": "test-id", "title": "café"}
+    data = (json.dumps(msg, ensure_ascii=False) + "\n").encode("utf-8")
+    split = data.index("é".encode("utf-8")) + 1
+    client.sendall(data[:split])
+    time.sleep(0.1)
+    client.sendall(data[split:])
+
+    response = json.loads(client.recv(4096).decode("utf-8").strip().split("\n")[0])
+    assert response["lode"]["title"] == "café"
+
+    client.close()
+
+
+def test_server_handles_message_larger_than_recv_chunk(socket_path, server, temp_config, make_lode):
+    """A line spanning several reads is reassembled before parsing."""
+    lode = make_lode(id="test-id")
+    server.lodes = [lode]
+    save_lodes(server.lodes)
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(str(socket_path))
+    client.settimeout(2.0)
+
+    title = "x" * (SERVER_RECV_CHUNK * 3)
+    msg = {"type": "lode_set_title", "lode_id": "test-id", "title": title}
+    client.sendall((json.dumps(msg) + "\n").encode("utf-8"))
+
+    for _ in range(50):
+        if server.lodes[0]["title"] == title:
+            break
+        time.sleep(0.1)
+    assert server.lodes[0]["title"] == title
+
+    client.close()
+
+
+def test_server_ignores_non_object_json(socket_path, server):
+    """A valid JSON line that isn't an object is skipped; the server keeps serving."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(str(socket_path))
+    client.settimeout(2.0)
+
+    client.sendall(b'[1]\n"x"\n{"type": "ping"}\n')
+
+    response = json.loads(client.recv(4096))
+    assert response["type"] == "pong"
+
+    client.close()
+
+
+def test_server_drops_only_client_whose_message_fails(socket_path, server):
+    """An error handling one client's message drops that client, not the server."""
+    bad = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    bad.connect(str(socket_path))
+    bad.settimeout(2.0)
+    good = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    good.connect(str(socket_path))
+    good.settimeout(2.0)
+
+    with patch.object(server, "_handle_read_only", side_effect=RuntimeError("boom")):
+        bad.sendall(b'{"type": "ping"}\n')
+        assert bad.recv(4096) == b""
+
+    good.sendall(b'{"type": "ping"}\n')
+    assert json.loads(good.recv(4096))["type"] == "pong"
+    assert socket_path.exists()
+
+    bad.close()
+    good.close()
+
+
 def test_server_handles_lode_set_title(socket_path, server, temp_config, make_lode):
     """Server handles lode_set_title message."""
     lode = make_lode(id="test-id")
@@ -1195,11 +1526,7 @@ class TestActivityLog:
         thread = threading.Thread(target=srv.start, daemon=True)
         thread.start()
 
-        for _ in range(50):
-            if socket_path.exists():
-                break
-            time.sleep(0.1)
-        else:
+        if not srv.ready.wait(timeout=5):
             raise TimeoutError("Server did not start")
 
         assert srv._log_handler is not None
@@ -6,9 +6,12 @@
 from unittest.mock import patch
 
 from hopper.tmux import (
+    PANE_DIGEST_FORMAT,
     capture_pane,
     get_current_pane_id,
     get_current_tmux_location,
+    get_pane_digest,
+    get_pane_status,
     get_tmux_sessions,
     is_inside_tmux,
     is_tmux_server_running,
@@ -123,6 +126,53 @@ class TestGetCurrentTmuxLocation:
                 assert result is None
 
 
+class TestGetPaneDigest:
+    def test_returns_digest_on_success(self):
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value.returncode = 0
+            mock_run.return_value.stdout = "120|4|33|0|1767225600\n"
+            result = get_pane_digest("%1")
+            assert result == "120|4|33|0|1767225600"
+            mock_run.assert_called_once_with(
+                ["tmux", "display-message", "-p", "-t", "%1", PANE_DIGEST_FORMAT],
+                capture_output=True,
+                text=True,
+            )
+
+    def test_returns_none_when_command_fails(self):
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value.returncode = 1
+            mock_run.return_value.stdout = ""
+            assert get_pane_digest("%99") is None
+
+    def test_returns_none_when_tmux_not_installed(self):
+        with patch("subprocess.run", side_effect=FileNotFoundError):
+            assert get_pane_digest("%1") is None
+
+
+class TestGetPaneStatus:
+    def test_returns_digest_and_contents_from_one_call(self):
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value.returncode = 0
+            mock_run.return_value.stdout = b"120|4|33|0|1767225600\nline one\nline two\n"
+            result = get_pane_status("%1")
+            assert result == ("120|4|33|0|1767225600", b"line one\nline two\n")
+            mock_run.assert_called_once()
+            args = mock_run.call_args[0][0]
+            assert args[:6] == ["tmux", "display-message", "-p", "-t", "%1", PANE_DIGEST_FORMAT]
+            assert args[6:] == [";", "capture-pane", "-e", "-p", "-t", "%1"]
+
+    def test_returns_none_when_command_fails(self):
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value.returncode = 1
+            mock_run.return_value.stdout = b""
+            assert get_pane_status("%99") is None
+
+    def test_returns_none_when_tmux_not_installed(self):
+        with patch("subprocess.run", side_effect=FileNotFoundError):
+            assert get_pane_status("%1") is None
+
+
 class TestCapturePane:
     def test_returns_content_on_success(self):
         with patch("subprocess.run") as mock_run:
@@ -185,6 +235,16 @@ class TestSendKeys:
                 text=True,
             )
 
+    def test_sends_multiple_keys_in_one_call(self):
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value.returncode = 0
+            assert send_keys("%1", "C-d", "C-d") is True
+            mock_run.assert_called_once_with(
+                ["tmux", "send-keys", "-t", "%1", "C-d", "C-d"],
+                capture_output=True,
+                text=True,
+            )
+
     def test_returns_false_when_command_fails(self):
         with patch("subprocess.run") as mock_run:
             mock_run.return_value.returncode = 1
@@ -8,11 +8,14 @@ from unittest.mock import MagicMock, PropertyMock, patch
 import pytest
 from textual.app import App
 
-from hopper.lodes import format_age
+from hopper.lodes import current_time_ms, format_age
 from hopper.projects import Project
 from hopper.tui import (
+    AGE_REFRESH_MS,
     AUTO_OFF,
     AUTO_ON,
+    HINT_LODE,
+    HINT_LODE_ARCHIVED,
     STATUS_DISCONNECTED,
     STATUS_ERROR,
     STATUS_NEW,
@@ -23,6 +26,7 @@ from hopper.tui import (
     FileViewerScreen,
     HopperApp,
     LegendScreen,
+    LodeTable,
     ProjectPickerScreen,
     Row,
     ScopeInputScreen,
@@ -468,6 +472,7 @@ class MockServer:
         self.projects = projects if projects is not None else []
         self.git_hash = git_hash
         self.started_at = started_at
+        self.state_version = 0
         self.broadcasts: list[dict] = []
         self.events: list[dict] = []
 
@@ -866,6 +871,94 @@ async def test_get_lode():
         assert session is None
 
 
+@pytest.mark.asyncio
+async def test_get_lode_follows_refresh():
+    """_get_lode should reflect lodes added or removed as of the last refresh."""
+    sessions = [{"id": "aaaa1111", "stage": "mill", "created_at": 1000}]
+    server = MockServer(sessions)
+    app = HopperApp(server=server)
+    async with app.run_test():
+        sessions.append({"id": "bbbb2222", "stage": "refine", "created_at": 2000})
+        sessions.pop(0)
+        app.refresh_table()
+
+        assert app._get_lode("aaaa1111") is None
+        assert app._get_lode("bbbb2222")["stage"] == "refine"
+
+
+@pytest.mark.asyncio
+async def test_check_server_updates_skips_unchanged():
+    """Polling only rebuilds tables after a server mutation or an age tick."""
+    server = MockServer([{"id": "aaaa1111", "stage": "mill", "created_at": 1000}])
+    app = HopperApp(server=server)
+    async with app.run_test():
+        with (
+            patch("hopper.tui.current_time_ms", return_value=0),
+            patch.object(app, "refresh_table") as mock_table,
+            patch.object(app, "refresh_backlog") as mock_backlog,
+        ):
+            app.check_server_updates()
+            app.check_server_updates()
+            assert mock_table.call_count == 1
+            assert mock_backlog.call_count == 1
+
+            server.state_version += 1
+            app.check_server_updates()
+            assert mock_table.call_count == 2
+
+        with (
+            patch("hopper.tui.current_time_ms", return_value=AGE_REFRESH_MS),
+            patch.object(app, "refresh_table") as mock_table,
+            patch.object(app, "refresh_backlog"),
+        ):
+            app.check_server_updates()
+            mock_table.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_refresh_table_skips_unchanged_rows():
+    """refresh_table only rewrites cells of rows whose contents changed."""
+    now = current_time_ms()
+    sessions = [
+        {"id": "aaaa1111", "stage": "mill", "created_at": now, "active": True},
+        {"id": "bbbb2222", "stage": "refine", "created_at": now, "active": True},
+    ]
+    server = MockServer(sessions)
+    app = HopperApp(server=server)
+    async with app.run_test():
+        table = app.query_one("#lode-table", LodeTable)
+        with patch.object(table, "update_cell", wraps=table.update_cell) as mock_update:
+            app.refresh_table()
+            mock_update.assert_not_called()
+
+            sessions[1]["title"] = "Renamed"
+            app.refresh_table()
+            updated = {call.args[0] for call in mock_update.call_args_list}
+            assert updated == {"bbbb2222"}
+
+            mock_update.reset_mock()
+            app._archive_view = True
+            app.refresh_table()
+            mock_update.assert_called_once_with(
+                HINT_LODE, LodeTable.COL_STATUS_TEXT, HINT_LODE_ARCHIVED
+            )
+
+
+@pytest.mark.asyncio
+async def test_get_lode_reindexes_after_server_change():
+    """_get_lode should not return an archived lode before the next refresh."""
+    sessions = [{"id": "aaaa1111", "stage": "mill", "created_at": 1000}]
+    server = MockServer(sessions)
+    app = HopperApp(server=server)
+    async with app.run_test():
+        sessions.pop(0)
+        sessions.append({"id": "bbbb2222", "stage": "refine", "created_at": 2000})
+        server.state_version += 1
+
+        assert app._get_lode("aaaa1111") is None
+        assert app._get_lode("bbbb2222")["stage"] == "refine"
+
+
 # Tests for ProjectPickerScreen
 
 